@@ -1,7 +1,19 @@
 from django.apps import AppConfig
+from django.core.exceptions import ImproperlyConfigured
 
 
 class DjangoTeamEventsConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "django_team_events"
-    verbose_name = "Django Team Events"
\ No newline at end of file
+    verbose_name = "Django Team Events"
+
+    def ready(self):
+        from django_team_events.config import get_sampling
+        from django_team_events.sampling import validate_sampling
+
+        sampling = get_sampling()
+        if sampling:
+            try:
+                validate_sampling(sampling)
+            except ValueError as exc:
+                raise ImproperlyConfigured(f"DJANGO_TEAM_EVENTS['SAMPLING']: {exc}")
@@ -4,3 +4,35 @@ from django.conf import settings
 def get_gchat_webhook():
     config = getattr(settings, "DJANGO_TEAM_EVENTS", {})
     return config.get("GCHAT_WEBHOOK")
+
+
+def get_delivery_mode():
+    config = getattr(settings, "DJANGO_TEAM_EVENTS", {})
+    return config.get("DELIVERY", "sync")
+
+
+def get_sampling():
+    config = getattr(settings, "DJANGO_TEAM_EVENTS", {})
+    return config.get("SAMPLING")
+
+
+def get_spool_settings():
+    config = getattr(settings, "DJANGO_TEAM_EVENTS", {})
+    return {
+        "dir": config.get("SPOOL_DIR"),
+        "segment_seconds": config.get("SPOOL_SEGMENT_SECONDS", 300),
+        "batch_size": config.get("SPOOL_BATCH_SIZE", 50),
+        "rate_limit": config.get("SPOOL_RATE_LIMIT", 1.0),
+        "poll_interval": config.get("SPOOL_POLL_INTERVAL", 1.0),
+    }
+
+
+def get_render_limits():
+    from django_team_events.providers.google_chat import MAX_MESSAGE_LENGTH
+
+    config = getattr(settings, "DJANGO_TEAM_EVENTS", {})
+    return {
+        "max_value_length": config.get("MAX_VALUE_LENGTH", 200),
+        "type_max_lengths": config.get("MAX_VALUE_LENGTHS", {}),
+        "max_message_length": min(config.get("MAX_MESSAGE_LENGTH", MAX_MESSAGE_LENGTH), MAX_MESSAGE_LENGTH),
+    }
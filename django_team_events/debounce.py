@@ -0,0 +1,112 @@
+import atexit
+import logging
+import threading
+import time
+
+from django_team_events.events import LargeValue
+
+logger = logging.getLogger(__name__)
+
+
+class _Pending:
+    __slots__ = ("event", "diff", "first_seen", "last_seen")
+
+    def __init__(self, event, now: float):
+        self.event = event
+        self.diff = event.changes
+        self.first_seen = now
+        self.last_seen = now
+
+    def merge(self, event, now: float) -> None:
+        self.event = event
+        for field, old, new in event.diff:
+            if field in self.diff:
+                old = self.diff[field][0]
+            self.diff[field] = (old, new)
+        self.last_seen = now
+
+    def net_event(self):
+        diff = tuple(
+            (field, old, new)
+            for field, (old, new) in self.diff.items()
+            if isinstance(old, LargeValue) or old != new
+        )
+        if not diff:
+            return None
+        return self.event.replace(diff=diff)
+
+
+class Debouncer:
+    """Hold update events per key until they have been quiet for `delay` seconds.
+
+    Successive update events for the same key are merged so a single event
+    carries the net change from the first old value to the last new value. An
+    entry is never held longer than `max_hold` seconds, so continuous churn
+    still reports periodically.
+    """
+
+    def __init__(self, delay: float, max_hold: float, emit, clock=time.monotonic):
+        self.delay = delay
+        self.max_hold = max_hold
+        self.emit = emit
+        self.clock = clock
+        self._pending = {}
+        self._lock = threading.Lock()
+        self._timer = None
+        atexit.register(self.flush, force=True)
+
+    def add(self, key, event) -> None:
+        now = self.clock()
+        with self._lock:
+            entry = self._pending.get(key)
+            if entry is None:
+                self._pending[key] = _Pending(event, now)
+            else:
+                entry.merge(event, now)
+        self._schedule()
+
+    def flush(self, force: bool = False) -> None:
+        """Emit every entry that is due, or all of them when force is set."""
+        now = self.clock()
+        with self._lock:
+            due = [
+                key for key, entry in self._pending.items()
+                if force or now >= self._due_at(entry)
+            ]
+            entries = [self._pending.pop(key) for key in due]
+        self._emit(entries)
+
+    def flush_key(self, key) -> None:
+        """Emit the pending entry for key now, if there is one."""
+        with self._lock:
+            entry = self._pending.pop(key, None)
+        if entry is not None:
+            self._emit([entry])
+
+    def _emit(self, entries: list) -> None:
+        for entry in entries:
+            event = entry.net_event()
+            if event is None:
+                continue
+            try:
+                self.emit(event)
+            except Exception:
+                logger.exception("django-team-events: error emitting debounced update")
+
+    def _due_at(self, entry: _Pending) -> float:
+        return min(entry.last_seen + self.delay, entry.first_seen + self.max_hold)
+
+    def _schedule(self) -> None:
+        with self._lock:
+            if self._timer is not None or not self._pending:
+                return
+            wait = max(0.0, min(self._due_at(e) for e in self._pending.values()) - self.clock())
+            self._timer = threading.Timer(wait, self._tick)
+            self._timer.daemon = True
+            self._timer.start()
+
+    def _tick(self) -> None:
+        with self._lock:
+            self._timer = None
+        self.flush()
+        self._schedule()
@@ -0,0 +1,92 @@
+import atexit
+import logging
+import queue
+import threading
+
+from django_team_events.config import get_delivery_mode, get_render_limits
+
+logger = logging.getLogger(__name__)
+
+
+def dispatch(event) -> None:
+    """Hand a captured event to the configured delivery stage."""
+    mode = get_delivery_mode()
+    if mode == "thread":
+        _worker.put(event)
+        return
+    if mode == "spool":
+        from django_team_events import spool
+        try:
+            spool.append(event)
+        except Exception:
+            logger.exception("django-team-events: error spooling %r", event)
+        return
+    if mode != "sync":
+        logger.warning("django-team-events: unknown DELIVERY %r, delivering synchronously", mode)
+    deliver(event)
+
+
+def deliver(event) -> None:
+    """Render event and send it through the provider."""
+    from django_team_events.formatter import render
+    from django_team_events.providers import google_chat
+
+    try:
+        message = render(event, get_template(event.model_label), get_render_limits())
+    except Exception:
+        logger.exception("django-team-events: error rendering %r", event)
+        return
+    google_chat.send(message)
+
+
+def get_template(model_label: str) -> dict:
+    from django.apps import apps
+
+    from django_team_events.team_events import TeamEvents
+
+    try:
+        model = apps.get_model(model_label)
+    except (LookupError, ValueError):
+        return {}
+    for value in vars(model).values():
+        if isinstance(value, TeamEvents):
+            return value.template
+    return {}
+
+
+def flush() -> None:
+    """Block until the background delivery thread has drained its queue."""
+    _worker.join()
+
+
+class _Worker:
+    def __init__(self):
+        self._queue = queue.Queue()
+        self._thread = None
+        self._lock = threading.Lock()
+
+    def put(self, event) -> None:
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(
+                    target=self._run, name="django-team-events-delivery", daemon=True
+                )
+                self._thread.start()
+        self._queue.put(event)
+
+    def join(self) -> None:
+        self._queue.join()
+
+    def _run(self) -> None:
+        while True:
+            event = self._queue.get()
+            try:
+                deliver(event)
+            except Exception:
+                logger.exception("django-team-events: error delivering %r", event)
+            finally:
+                self._queue.task_done()
+
+
+_worker = _Worker()
+atexit.register(flush)
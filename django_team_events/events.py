@@ -0,0 +1,145 @@
+import json
+import time
+from typing import NamedTuple
+
+from django.core.serializers.json import DjangoJSONEncoder
+
+
+class LargeValue(NamedTuple):
+    """Stand-in for a large field value; inexact sizes are lower bounds."""
+
+    size: int
+    unit: str = "bytes"
+    exact: bool = True
+
+    def __str__(self):
+        return f"<{'' if self.exact else '≥'}{self.size} {self.unit}>"
+
+
+class Event:
+    """Compact, immutable record of one captured model event.
+
+    Holds only plain values (never model instances), so it can be queued,
+    pickled or serialized to JSON and rendered later by the delivery stage.
+    `values` is a tuple of (field, value) pairs and `diff` a tuple of
+    (field, old, new) triples.
+    """
+
+    __slots__ = ("model_label", "pk", "action", "values", "diff", "timestamp", "object_repr")
+
+    def __init__(
+        self,
+        model_label: str,
+        pk,
+        action: str,
+        values: tuple = (),
+        diff: tuple = (),
+        timestamp: float = None,
+        object_repr: str = None,
+    ):
+        setter = object.__setattr__
+        setter(self, "model_label", model_label)
+        setter(self, "pk", pk)
+        setter(self, "action", action)
+        setter(self, "values", tuple((name, _own(value)) for name, value in values))
+        setter(self, "diff", tuple((name, _own(old), _own(new)) for name, old, new in diff))
+        setter(self, "timestamp", time.time() if timestamp is None else timestamp)
+        setter(self, "object_repr", object_repr)
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"{type(self).__name__} is immutable")
+
+    def __delattr__(self, name):
+        raise AttributeError(f"{type(self).__name__} is immutable")
+
+    def __reduce__(self):
+        return (Event, tuple(getattr(self, slot) for slot in self.__slots__))
+
+    def __eq__(self, other):
+        if not isinstance(other, Event):
+            return NotImplemented
+        return all(getattr(self, s) == getattr(other, s) for s in self.__slots__)
+
+    def __hash__(self):
+        return hash((self.model_label, self.pk, self.action, self.timestamp))
+
+    def __repr__(self):
+        return f"<Event {self.action} {self.model_label} pk={self.pk!r}>"
+
+    @property
+    def model_name(self) -> str:
+        return self.model_label.rpartition(".")[2]
+
+    @property
+    def fields(self) -> dict:
+        return dict(self.values)
+
+    @property
+    def changes(self) -> dict:
+        return {name: (old, new) for name, old, new in self.diff}
+
+    def replace(self, **changes) -> "Event":
+        kwargs = {slot: getattr(self, slot) for slot in self.__slots__}
+        kwargs.update(changes)
+        return Event(**kwargs)
+
+    def to_dict(self) -> dict:
+        return {
+            "model_label": self.model_label,
+            "pk": self.pk,
+            "action": self.action,
+            "values": [[name, _dump(value)] for name, value in self.values],
+            "diff": [[name, _dump(old), _dump(new)] for name, old, new in self.diff],
+            "timestamp": self.timestamp,
+            "object_repr": self.object_repr,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "Event":
+        return cls(
+            model_label=data["model_label"],
+            pk=data["pk"],
+            action=data["action"],
+            values=[(name, _load(value)) for name, value in data.get("values", ())],
+            diff=[(name, _load(old), _load(new)) for name, old, new in data.get("diff", ())],
+            timestamp=data.get("timestamp"),
+            object_repr=data.get("object_repr"),
+        )
+
+    def to_json(self) -> str:
+        return json.dumps(self.to_dict(), cls=DjangoJSONEncoder, separators=(",", ":"))
+
+    @classmethod
+    def from_json(cls, data) -> "Event":
+        return cls.from_dict(json.loads(data))
+
+
+def _own(value):
+    """Return a private copy of value that holds no reference to the instance.
+
+    Containers (JSONField values) are copied so later in-place changes to the
+    model instance don't alter the record, and binary data, which may be a
+    non-picklable memoryview, is replaced by its size.
+    """
+    if isinstance(value, (bytes, bytearray, memoryview)):
+        return LargeValue(memoryview(value).nbytes)
+    if isinstance(value, dict):
+        return {key: _own(child) for key, child in value.items()}
+    if isinstance(value, list):
+        return [_own(child) for child in value]
+    if isinstance(value, tuple) and not isinstance(value, LargeValue):
+        return tuple(_own(child) for child in value)
+    return value
+
+
+def _dump(value):
+    # NamedTuples would otherwise be encoded as plain JSON lists.
+    if isinstance(value, LargeValue):
+        return {"__large__": list(value)}
+    return value
+
+
+def _load(value):
+    if isinstance(value, dict) and set(value) == {"__large__"}:
+        return LargeValue(*value["__large__"])
+    return value
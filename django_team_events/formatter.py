@@ -1,33 +1,179 @@
+import reprlib
 from datetime import datetime
 
+from django_team_events.events import LargeValue
 
-def format_create(instance, fields: dict) -> str:
-    model_name = instance.__class__.__name__
-    timestamp = datetime.now().strftime("%Y-%m-%d %H:%M")
-    field_lines = "\n".join(f"- {k}: {v}" for k, v in fields.items())
-    return (
-        f"🔔 [{model_name}] Created\n"
-        f"ID: {instance.pk}\n"
-        f"Object: {instance}\n"
+TRUNCATION_MARKER = "…"
+
+# max_value_length applies to every value; type_max_lengths overrides it per
+# kind ("text", "json", "other"). Binary values are always shown by size.
+DEFAULT_LIMITS = {
+    "max_value_length": 200,
+    "type_max_lengths": {},
+    "max_message_length": 4096,
+}
+
+
+def render(event, template: dict = None, limits: dict = None) -> str:
+    """Return the message for event, using template[action] when it applies."""
+    limits = {**DEFAULT_LIMITS, **(limits or {})}
+    message = _apply_template(template or {}, event.action, event.fields)
+    if message is None:
+        message = _FORMATTERS[event.action](event, limits)
+    return truncate(message, limits["max_message_length"])
+
+
+def render_value(value, limits: dict = None) -> str:
+    """Render value as text without ever producing more than its length limit."""
+    limits = limits or DEFAULT_LIMITS
+    if isinstance(value, LargeValue):
+        return str(value)
+    if isinstance(value, (bytes, bytearray, memoryview)):
+        return str(LargeValue(memoryview(value).nbytes))
+    if isinstance(value, str):
+        return truncate(value, _max_length(limits, "text"))
+    if isinstance(value, (dict, list, tuple)):
+        max_length = _max_length(limits, "json")
+        return truncate(_bounded_repr(max_length).repr(value), max_length)
+    return truncate(str(value), _max_length(limits, "other"))
+
+
+def truncate(text: str, max_length: int) -> str:
+    if max_length is None or len(text) <= max_length:
+        return text
+    marker = f"{TRUNCATION_MARKER} ({len(text)} chars)"
+    if len(marker) >= max_length:
+        marker = TRUNCATION_MARKER
+    return text[:max(max_length - len(marker), 0)] + marker
+
+
+def format_create(event, limits: dict = None) -> str:
+    limits = limits or DEFAULT_LIMITS
+    timestamp = datetime.fromtimestamp(event.timestamp).strftime("%Y-%m-%d %H:%M")
+    header = (
+        f"🔔 [{event.model_name}] Created\n"
+        f"ID: {event.pk}\n"
+        f"Object: {render_value(event.object_repr, limits)}\n"
         f"Time: {timestamp}\n"
-        f"{field_lines}"
     )
+    lines = (f"- {k}: {render_value(v, limits)}" for k, v in event.values)
+    return header + _within_budget(header, lines, len(event.values), limits)
+
+
+def format_delete(event, limits: dict = None) -> str:
+    limits = limits or DEFAULT_LIMITS
+    return (
+        f"🗑 [{event.model_name}] Deleted\n"
+        f"ID: {event.pk}\n"
+        f"Object: {render_value(event.object_repr, limits)}"
+    )
+
+
+def format_update(event, limits: dict = None) -> str:
+    limits = limits or DEFAULT_LIMITS
+    header = (
+        f"✏️ [{event.model_name}] Updated\n"
+        f"ID: {event.pk}\n"
+        f"Changes:\n"
+    )
+    lines = (
+        f"- {field}: {render_value(old, limits)} → {render_value(new, limits)}"
+        for field, old, new in event.diff
+    )
+    return header + _within_budget(header, lines, len(event.diff), limits)
 
 
-def format_delete(instance) -> str:
-    model_name = instance.__class__.__name__
+def format_m2m(event, limits: dict = None) -> str:
+    fields = event.fields
+    lines = []
+    if fields["cleared"]:
+        lines.append("- cleared")
+    for action in ("added", "removed"):
+        count = fields[action]
+        if count:
+            lines.append(f"- {action}: {count} {_sample(fields[f'{action}_sample'], count)}")
+    changes = "\n".join(lines)
+    # Changes made from the related side list this model's ids instead.
+    target = f"Via: {fields['via']}" if fields.get("via") else f"ID: {event.pk}"
     return (
-        f"🗑 [{model_name}] Deleted\n"
-        f"ID: {instance.pk}\n"
-        f"Object: {instance}"
+        f"🔗 [{event.model_name}] {fields['field']} changed\n"
+        f"{target}\n"
+        f"{changes}"
     )
 
 
-def format_update(instance, diff: dict) -> str:
-    model_name = instance.__class__.__name__
-    changes = "\n".join(f"- {field}: {old} → {new}" for field, (old, new) in diff.items())
+def _sample(pks, count: int) -> str:
+    shown = ", ".join(str(pk) for pk in pks)
+    if count > len(pks):
+        shown += f", … +{count - len(pks)} more"
+    return f"({shown})"
+
+
+def format_suppressed(event, limits: dict = None) -> str:
+    total = sum(count for _, count in event.values)
+    breakdown = "\n".join(f"- {action}: {count}" for action, count in event.values)
     return (
-        f"✏️ [{model_name}] Updated\n"
-        f"ID: {instance.pk}\n"
-        f"Changes:\n{changes}"
+        f"🔕 [{event.model_name}] {total} events suppressed\n"
+        f"{breakdown}"
     )
+
+
+def format_sampled(event, limits: dict = None) -> str:
+    total = sum(count for _, count in event.values)
+    breakdown = "\n".join(f"- {action}: {count}" for action, count in event.values)
+    return (
+        f"📉 [{event.model_name}] {total} more events suppressed by sampling\n"
+        f"{breakdown}"
+    )
+
+
+def _within_budget(header: str, lines, count: int, limits: dict) -> str:
+    """Join lazily rendered lines until the message budget is used up."""
+    budget = limits["max_message_length"] - len(header)
+    kept = []
+    used = 0
+    for index, line in enumerate(lines):
+        remaining = count - index - 1
+        # Leave room for the "… N more" footer while later lines are pending.
+        reserve = len(f"\n{TRUNCATION_MARKER} {remaining} more") if remaining else 0
+        if used + len(line) + reserve > budget:
+            kept.append(f"{TRUNCATION_MARKER} {count - index} more")
+            break
+        kept.append(line)
+        used += len(line) + 1
+    return "\n".join(kept)
+
+
+def _max_length(limits: dict, kind: str):
+    return limits["type_max_lengths"].get(kind, limits["max_value_length"])
+
+
+def _bounded_repr(max_length) -> reprlib.Repr:
+    # reprlib stops descending once its size limits are reached, so nested
+    # JSON is never fully stringified just to be truncated afterwards.
+    bounded = reprlib.Repr()
+    bounded.maxlevel = 3
+    bounded.maxdict = bounded.maxlist = bounded.maxtuple = 20
+    bounded.maxstring = bounded.maxother = max_length or 200
+    return bounded
+
+
+_FORMATTERS = {
+    "create": format_create,
+    "update": format_update,
+    "delete": format_delete,
+    "m2m": format_m2m,
+    "suppressed": format_suppressed,
+    "sampled": format_sampled,
+}
+
+
+def _apply_template(template: dict, action: str, fields: dict):
+    """Return formatted template string for action, or None to signal fallback."""
+    tmpl = template.get(action)
+    if tmpl is None:
+        return None
+    try:
+        return tmpl.format(**fields)
+    except (KeyError, AttributeError, TypeError):
+        return None
@@ -0,0 +1,94 @@
+import threading
+from itertools import islice
+
+from django.db import transaction
+
+_pending = threading.local()
+
+
+class M2MBatch:
+    """Accumulates the m2m_changed signals of one object/field until commit.
+
+    Only counts and a capped sample of related pks are kept; related instances
+    are never loaded. `tags.set(...)` (a remove followed by an add inside one
+    atomic block) therefore produces a single batch.
+    """
+
+    __slots__ = ("key", "using", "sample_size", "added", "removed", "cleared",
+                 "added_sample", "removed_sample", "emit")
+
+    def __init__(self, key, using: str, sample_size: int, emit):
+        self.key = key
+        self.using = using
+        self.sample_size = sample_size
+        self.added = 0
+        self.removed = 0
+        self.cleared = False
+        self.added_sample = []
+        self.removed_sample = []
+        self.emit = emit
+
+    def record(self, action: str, pk_set) -> None:
+        if action == "post_clear":
+            self.cleared = True
+        elif action == "post_add":
+            self.added += len(pk_set)
+            _extend_sample(self.added_sample, pk_set, self.sample_size)
+        elif action == "post_remove":
+            self.removed += len(pk_set)
+            _extend_sample(self.removed_sample, pk_set, self.sample_size)
+
+    def values(self) -> tuple:
+        return (
+            ("field", self.key[2]),
+            ("added", self.added),
+            ("removed", self.removed),
+            ("cleared", self.cleared),
+            ("added_sample", tuple(_sorted(self.added_sample))),
+            ("removed_sample", tuple(_sorted(self.removed_sample))),
+        )
+
+    def flush(self) -> None:
+        batches = getattr(_pending, "batches", {})
+        if batches.get(self.key) is self:
+            del batches[self.key]
+        if self.added or self.removed or self.cleared:
+            self.emit(self)
+
+
+def record_m2m(key, action: str, pk_set, using: str, sample_size: int, emit) -> None:
+    """Merge one post_add/post_remove/post_clear into the pending batch for key.
+
+    The batch is emitted once the surrounding transaction commits (immediately
+    in autocommit mode), so every change made in one transaction is reported
+    together and rolled-back changes are never reported.
+    """
+    batches = _pending.__dict__.setdefault("batches", {})
+    batch = batches.get(key)
+    if batch is not None and not _awaiting_commit(batch):
+        batch = None
+    if batch is None:
+        batch = M2MBatch(key, using, sample_size, emit)
+        batches[key] = batch
+        batch.record(action, pk_set)
+        transaction.on_commit(batch.flush, using=using)
+    else:
+        batch.record(action, pk_set)
+
+
+def _awaiting_commit(batch: M2MBatch) -> bool:
+    # A batch whose transaction was rolled back has lost its on_commit hook.
+    connection = transaction.get_connection(batch.using)
+    return any(entry[1] == batch.flush for entry in connection.run_on_commit)
+
+
+def _extend_sample(sample: list, pk_set, size: int) -> None:
+    if len(sample) < size:
+        sample.extend(islice(pk_set, size - len(sample)))
+
+
+def _sorted(pks: list) -> list:
+    try:
+        return sorted(pks)
+    except TypeError:
+        return pks
@@ -0,0 +1,48 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from django_team_events.config import get_gchat_webhook, get_spool_settings
+from django_team_events.spool import SpoolSender
+
+
+class Command(BaseCommand):
+    help = "Deliver events spooled by DELIVERY='spool' workers, batched and rate-limited."
+
+    def add_arguments(self, parser):
+        spool = get_spool_settings()
+        parser.add_argument("--spool-dir", default=spool["dir"])
+        parser.add_argument("--batch-size", type=int, default=spool["batch_size"])
+        parser.add_argument("--rate-limit", type=float, default=spool["rate_limit"],
+                            help="Maximum messages sent per second.")
+        parser.add_argument("--poll-interval", type=float, default=spool["poll_interval"])
+        parser.add_argument("--once", action="store_true",
+                            help="Deliver everything currently spooled, then exit.")
+
+    def handle(self, *args, **options):
+        if not options["spool_dir"]:
+            raise CommandError("Set DJANGO_TEAM_EVENTS['SPOOL_DIR'] or pass --spool-dir.")
+        if not get_gchat_webhook():
+            # Every send would be refused and the spool would only grow.
+            raise CommandError("Set DJANGO_TEAM_EVENTS['GCHAT_WEBHOOK'] before running the sender.")
+
+        sender = SpoolSender(
+            options["spool_dir"],
+            batch_size=options["batch_size"],
+            rate_limit=options["rate_limit"],
+            segment_seconds=get_spool_settings()["segment_seconds"],
+        )
+        try:
+            if options["once"]:
+                total = 0
+                with sender.exclusive():
+                    while True:
+                        consumed = sender.run_once()
+                        if not consumed:
+                            break
+                        total += consumed
+                self.stdout.write(f"Delivered {total} spooled events.")
+            else:
+                sender.run_forever(poll_interval=options["poll_interval"])
+        except RuntimeError as exc:
+            raise CommandError(str(exc))
+        except KeyboardInterrupt:
+            pass
@@ -6,14 +6,20 @@ from django_team_events.config import get_gchat_webhook
 
 logger = logging.getLogger(__name__)
 
+# Google Chat rejects text messages above this many characters.
+MAX_MESSAGE_LENGTH = 4096
 
-def send(message: str) -> None:
+
+def send(message: str) -> bool:
+    """Post message to the webhook; return True if it was accepted."""
     webhook = get_gchat_webhook()
     if not webhook:
-        return
+        return False
 
     try:
         response = requests.post(webhook, json={"text": message}, timeout=5)
         response.raise_for_status()
     except Exception:
         logger.exception("django-team-events: failed to send Google Chat notification")
+        return False
+    return True
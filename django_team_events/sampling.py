@@ -0,0 +1,153 @@
+import atexit
+import logging
+import random
+import threading
+import time
+from collections import Counter
+
+logger = logging.getLogger(__name__)
+
+MODES = ("every_nth", "probabilistic")
+
+
+def validate_sampling(options) -> None:
+    """Raise ValueError unless options can configure an AdaptiveSampler."""
+    if not isinstance(options, dict):
+        raise ValueError(f"sampling options must be a dict, not {type(options).__name__}")
+    unknown = set(options) - {"threshold", "window", "mode", "every", "probability", "summary_interval"}
+    if unknown:
+        raise ValueError(f"unknown sampling options: {', '.join(sorted(unknown))}")
+    if "threshold" not in options:
+        raise ValueError("sampling options need a 'threshold' (events per second)")
+    if options.get("mode", "every_nth") not in MODES:
+        raise ValueError(f"unknown sampling mode {options['mode']!r}")
+    threshold = options["threshold"]
+    if not _is_number(threshold) or threshold < 0:
+        raise ValueError(f"sampling option 'threshold' must be a non-negative number, not {threshold!r}")
+    for name in ("window", "summary_interval"):
+        value = options.get(name, 1)
+        if not _is_number(value) or value <= 0:
+            raise ValueError(f"sampling option {name!r} must be a positive number, not {value!r}")
+    every = options.get("every", 1)
+    if not isinstance(every, int) or isinstance(every, bool) or every < 1:
+        raise ValueError(f"sampling option 'every' must be an integer of at least 1, not {every!r}")
+    probability = options.get("probability", 0)
+    if not _is_number(probability) or not 0 <= probability <= 1:
+        raise ValueError(f"sampling option 'probability' must be between 0 and 1, not {probability!r}")
+
+
+def _is_number(value) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+class AdaptiveSampler:
+    """Switch a model to sampled delivery while its event rate is too high.
+
+    The rate is measured over a sliding `window` (seconds). Above `threshold`
+    events per second only every `every`-th event (mode "every_nth") or a
+    random `probability` share of events (mode "probabilistic") is admitted.
+    Skipped events are counted exactly and reported as one summary at most
+    every `summary_interval` seconds, and once more when the rate drops back
+    to the threshold and full delivery resumes.
+    """
+
+    def __init__(
+        self,
+        threshold: float,
+        emit,
+        window: float = 10.0,
+        mode: str = "every_nth",
+        every: int = 10,
+        probability: float = 0.1,
+        summary_interval: float = 60.0,
+        clock=time.monotonic,
+        rand=random.random,
+    ):
+        if mode not in MODES:
+            raise ValueError(f"unknown sampling mode {mode!r}")
+        self.threshold = threshold
+        self.emit = emit
+        self.window = window
+        self.mode = mode
+        self.every = every
+        self.probability = probability
+        self.summary_interval = summary_interval
+        self.clock = clock
+        self.rand = rand
+        self.sampling = False
+        self._lock = threading.Lock()
+        self._bucket_start = clock()
+        self._current = 0
+        self._previous = 0
+        self._seen = 0
+        self._skipped = {}
+        self._timer = None
+        atexit.register(self.flush)
+
+    def admit(self, event) -> bool:
+        """Record event and return whether it should be delivered."""
+        now = self.clock()
+        with self._lock:
+            rate = self._observe(now)
+            if not self.sampling and rate > self.threshold:
+                self.sampling = True
+                self._seen = 0
+            elif self.sampling and rate <= self.threshold:
+                self.sampling = False
+            if not self.sampling:
+                resumed = bool(self._skipped)
+            else:
+                resumed = False
+                if self._take():
+                    return True
+                skipped = self._skipped.setdefault(event.model_label, Counter())
+                skipped[event.action] += 1
+                self._schedule()
+                return False
+        if resumed:
+            self.flush()
+        return True
+
+    def flush(self) -> None:
+        """Emit a summary of everything skipped since the last one."""
+        from django_team_events.events import Event
+
+        with self._lock:
+            skipped, self._skipped = self._skipped, {}
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+        for model_label, actions in skipped.items():
+            try:
+                self.emit(Event(model_label, None, "sampled", values=actions.items()))
+            except Exception:
+                logger.exception("django-team-events: error emitting sampling summary")
+
+    def _observe(self, now: float) -> float:
+        """Count one event and return the estimated rate over the last window."""
+        elapsed = now - self._bucket_start
+        if elapsed >= 2 * self.window:
+            self._previous, self._current = 0, 0
+            self._bucket_start = now
+            elapsed = 0.0
+        elif elapsed >= self.window:
+            self._previous, self._current = self._current, 0
+            self._bucket_start += self.window
+            elapsed -= self.window
+        self._current += 1
+        # Weight the previous bucket by how much of it is still in the window.
+        estimate = self._previous * (1 - elapsed / self.window) + self._current
+        return estimate / self.window
+
+    def _take(self) -> bool:
+        if self.mode == "probabilistic":
+            return self.rand() < self.probability
+        self._seen += 1
+        return (self._seen - 1) % self.every == 0
+
+    def _schedule(self) -> None:
+        if self._timer is not None:
+            return
+        self._timer = threading.Timer(self.summary_interval, self.flush)
+        self._timer.daemon = True
+        self._timer.start()
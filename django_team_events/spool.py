@@ -0,0 +1,297 @@
+"""Cross-process spool delivery.
+
+Workers append one JSON line per event to segment files in a local spool
+directory. A single sender process (``manage.py teamevents_sender``) tails the
+segments, batches events into as few messages as possible, rate-limits
+delivery and checkpoints its read offsets so it can resume after a crash.
+"""
+import heapq
+import json
+import logging
+import os
+import threading
+import time
+from contextlib import ExitStack
+from itertools import islice
+
+from django_team_events.events import Event
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - not available on Windows
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+SEGMENT_SUFFIX = ".jsonl"
+CHECKPOINT_NAME = ".checkpoint.json"
+LOCK_NAME = ".sender.lock"
+
+
+class SpoolWriter:
+    """Append-only writer for the current process.
+
+    Each process writes its own segment file, named after the time segment
+    and pid, so lines from different workers never interleave. Every event is
+    a single O_APPEND write of one complete line.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._fd = None
+        self._path = None
+
+    def append(self, spool_dir: str, segment_seconds: int, event) -> None:
+        line = (event.to_json() + "\n").encode("utf-8")
+        segment = int(time.time() // segment_seconds)
+        path = os.path.join(spool_dir, f"{segment:012d}-{os.getpid()}{SEGMENT_SUFFIX}")
+        with self._lock:
+            if path != self._path:
+                self._open(spool_dir, path)
+            os.write(self._fd, line)
+
+    def close(self) -> None:
+        with self._lock:
+            if self._fd is not None:
+                os.close(self._fd)
+            self._fd = None
+            self._path = None
+
+    def _open(self, spool_dir: str, path: str) -> None:
+        if self._fd is not None:
+            os.close(self._fd)
+        os.makedirs(spool_dir, exist_ok=True)
+        self._fd = os.open(path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        self._path = path
+
+
+_writer = SpoolWriter()
+
+
+def append(event) -> None:
+    from django_team_events.config import get_spool_settings
+
+    spool = get_spool_settings()
+    if not spool["dir"]:
+        logger.warning("django-team-events: DELIVERY is 'spool' but SPOOL_DIR is not set")
+        return
+    _writer.append(spool["dir"], spool["segment_seconds"], event)
+
+
+class SpoolSender:
+    """Deliver spooled events from every worker, in batches.
+
+    Read offsets are checkpointed only after a message has been accepted, so
+    delivery is at-least-once: a crash between sending and checkpointing
+    resends that one batch on restart.
+    """
+
+    def __init__(
+        self,
+        spool_dir: str,
+        batch_size: int = 50,
+        rate_limit: float = 1.0,
+        segment_seconds: int = 300,
+        max_length: int = None,
+        send=None,
+        clock=time.monotonic,
+        sleep=time.sleep,
+    ):
+        from django_team_events.providers import google_chat
+
+        self.spool_dir = spool_dir
+        self.batch_size = batch_size
+        self.min_interval = 1.0 / rate_limit if rate_limit else 0.0
+        self.segment_seconds = segment_seconds
+        self.max_length = max_length or google_chat.MAX_MESSAGE_LENGTH
+        self.send = send or google_chat.send
+        self.clock = clock
+        self.sleep = sleep
+        self._last_sent = None
+        self._tail_sizes = {}
+        self.checkpoint_path = os.path.join(spool_dir, CHECKPOINT_NAME)
+        self.offsets = self._load_checkpoint()
+
+    def run_forever(self, poll_interval: float = 1.0) -> None:
+        with self.exclusive():
+            while True:
+                if not self.run_once():
+                    self.sleep(poll_interval)
+
+    def run_once(self) -> int:
+        """Deliver up to one batch of pending events; return how many were consumed."""
+        entries = self._read_batch()
+        consumed = 0
+        for message, offsets, count in self._group(entries):
+            if message is not None:
+                self._throttle()
+                if not self.send(message):
+                    break
+            self.offsets.update(offsets)
+            self._save_checkpoint()
+            consumed += count
+        self._cleanup()
+        return consumed
+
+    def _read_batch(self) -> list:
+        """Return up to batch_size (name, end_offset, event) tuples, oldest event first.
+
+        Each worker writes its own files, so their lines are merged by event
+        timestamp; a busy worker can't hold back the others and cross-worker
+        order is kept.
+        """
+        with ExitStack() as stack:
+            readers = []
+            for name in self._segments():
+                f = stack.enter_context(open(os.path.join(self.spool_dir, name), "rb"))
+                f.seek(self.offsets.get(name, 0))
+                readers.append(_read_lines(name, f))
+            merged = heapq.merge(*readers, key=lambda entry: entry[0])
+            return [entry[1:] for entry in islice(merged, self.batch_size)]
+
+    def _group(self, entries: list):
+        """Yield (message, offsets, count) with messages packed up to max_length."""
+        from django_team_events.config import get_render_limits
+        from django_team_events.delivery import get_template
+        from django_team_events.formatter import render
+
+        limits = get_render_limits()
+        limits["max_message_length"] = min(limits["max_message_length"], self.max_length)
+        parts, offsets, count = [], {}, 0
+        for name, offset, event in entries:
+            message = None
+            if event is not None:
+                try:
+                    message = render(event, get_template(event.model_label), limits)
+                except Exception:
+                    logger.exception("django-team-events: error rendering %r", event)
+            if message is not None and parts and _joined_length(parts, message) > self.max_length:
+                yield "\n\n".join(parts), offsets, count
+                parts, offsets, count = [], {}, 0
+            if message is not None:
+                parts.append(message)
+            offsets[name] = offset
+            count += 1
+        if offsets:
+            yield ("\n\n".join(parts) if parts else None), offsets, count
+
+    def _throttle(self) -> None:
+        if self._last_sent is not None:
+            wait = self._last_sent + self.min_interval - self.clock()
+            if wait > 0:
+                self.sleep(wait)
+        self._last_sent = self.clock()
+
+    def _segments(self) -> list:
+        try:
+            names = os.listdir(self.spool_dir)
+        except FileNotFoundError:
+            return []
+        return sorted(n for n in names if n.endswith(SEGMENT_SUFFIX))
+
+    def _cleanup(self) -> None:
+        """Remove fully delivered segments that writers have moved past."""
+        current = int(time.time() // self.segment_seconds)
+        removed = False
+        for name in self._segments():
+            segment = int(name.split("-", 1)[0])
+            if segment >= current - 1:
+                continue
+            path = os.path.join(self.spool_dir, name)
+            size = os.path.getsize(path)
+            if self.offsets.get(name, 0) < size and not self._dead_tail(name, path, size):
+                continue
+            os.remove(path)
+            self.offsets.pop(name, None)
+            self._tail_sizes.pop(name, None)
+            removed = True
+        if removed:
+            self._save_checkpoint()
+
+    def _dead_tail(self, name: str, path: str, size: int) -> bool:
+        """Return whether the undelivered rest of an old segment is a stale partial line.
+
+        A worker that died mid-write leaves a line without its newline, which
+        _read_batch never consumes. Once the segment has stopped growing
+        between two cleanups the tail is given up on.
+        """
+        offset = self.offsets.get(name, 0)
+        with open(path, "rb") as f:
+            f.seek(offset)
+            if f.readline().endswith(b"\n"):
+                return False  # complete lines still to deliver
+        if self._tail_sizes.get(name) != size:
+            self._tail_sizes[name] = size
+            return False
+        logger.error(
+            "django-team-events: dropping %d-byte partial line at the end of %s",
+            size - offset, name,
+        )
+        return True
+
+    def _load_checkpoint(self) -> dict:
+        try:
+            with open(self.checkpoint_path) as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {}
+        except ValueError:
+            logger.error("django-team-events: unreadable spool checkpoint, starting from scratch")
+            return {}
+
+    def _save_checkpoint(self) -> None:
+        tmp_path = f"{self.checkpoint_path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(self.offsets, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.checkpoint_path)
+
+    def exclusive(self):
+        """Lock the spool directory for this sender; raises RuntimeError if taken."""
+        return _SenderLock(os.path.join(self.spool_dir, LOCK_NAME))
+
+
+class _SenderLock:
+    """Advisory lock so only one sender consumes a spool directory."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._file = None
+
+    def __enter__(self):
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        self._file = open(self.path, "w")
+        if fcntl is not None:
+            try:
+                fcntl.flock(self._file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except OSError:
+                self._file.close()
+                raise RuntimeError(f"another sender is already running on {os.path.dirname(self.path)}")
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self._file.close()
+        return False
+
+
+def _read_lines(name: str, f):
+    """Yield (timestamp, name, end_offset, event) for each complete line of f."""
+    offset = f.tell()
+    timestamp = float("-inf")
+    for line in f:
+        if not line.endswith(b"\n"):
+            return  # a write still in progress
+        offset += len(line)
+        try:
+            event = Event.from_json(line)
+        except (ValueError, KeyError, TypeError):
+            logger.error("django-team-events: skipping malformed spool line in %s", name)
+            event = None
+        else:
+            timestamp = event.timestamp
+        yield timestamp, name, offset, event
+
+
+def _joined_length(parts: list, message: str) -> int:
+    return sum(len(p) for p in parts) + 2 * len(parts) + len(message)
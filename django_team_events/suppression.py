@@ -0,0 +1,92 @@
+import contextvars
+import inspect
+import logging
+import threading
+from collections import Counter
+from contextlib import ContextDecorator
+from functools import wraps
+
+logger = logging.getLogger(__name__)
+
+_active_scopes = contextvars.ContextVar("django_team_events_suppressed", default=())
+
+
+class Suppressed(ContextDecorator):
+    """Context manager/decorator that silences TeamEvents receivers.
+
+    With no models every TeamEvents-enabled model is suppressed; otherwise only
+    the given model classes or "app_label.ModelName" labels are. State lives in
+    a context variable, so it is local to the current thread or async task.
+    When summary is set, one count message per model is sent on exit.
+    """
+
+    def __init__(self, *models, summary: bool = False):
+        self.labels = frozenset(_label(m) for m in models) or None
+        self.summary = summary
+        self._counts = {}
+        self._lock = threading.Lock()
+        self._tokens = []
+
+    def _recreate_cm(self):
+        # Each decorated call gets its own scope so concurrent calls don't
+        # share tokens or counters.
+        return Suppressed(*(self.labels or ()), summary=self.summary)
+
+    def __call__(self, func):
+        if not inspect.iscoroutinefunction(func):
+            return super().__call__(func)
+
+        # The plain wrapper would leave the scope before the coroutine runs.
+        @wraps(func)
+        async def inner(*args, **kwargs):
+            with self._recreate_cm():
+                return await func(*args, **kwargs)
+        return inner
+
+    def __enter__(self):
+        self._tokens.append(_active_scopes.set(_active_scopes.get() + (self,)))
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        _active_scopes.reset(self._tokens.pop())
+        if self.summary and not self._tokens:
+            self._send_summary()
+        return False
+
+    def matches(self, label: str) -> bool:
+        return self.labels is None or label in self.labels
+
+    def record(self, model_label: str, action: str) -> None:
+        if not self.summary:
+            return
+        with self._lock:
+            self._counts.setdefault(model_label, Counter())[action] += 1
+
+    def _send_summary(self) -> None:
+        with self._lock:
+            counts, self._counts = self._counts, {}
+        if not counts:
+            return
+
+        from django_team_events.delivery import dispatch
+        from django_team_events.events import Event
+
+        for model_label, actions in counts.items():
+            try:
+                dispatch(Event(model_label, None, "suppressed", values=actions.items()))
+            except Exception:
+                logger.exception("django-team-events: error sending suppression summary")
+
+
+def get_suppression(label: str):
+    """Return the innermost active scope suppressing label, or None."""
+    for scope in reversed(_active_scopes.get()):
+        if scope.matches(label):
+            return scope
+    return None
+
+
+def _label(model) -> str:
+    if isinstance(model, str):
+        return model
+    return model._meta.label
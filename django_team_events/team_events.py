@@ -1,7 +1,42 @@
-from django.db.models.signals import post_delete, post_save, pre_save
+import datetime
+import threading
+import uuid
+from decimal import Decimal
+from itertools import chain
+
+from django.core.exceptions import ObjectDoesNotExist
+from django.db.models.fields.files import FieldFile
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_delete, pre_save
+
+from django_team_events.config import get_sampling
+from django_team_events.delivery import dispatch
+from django_team_events.events import Event, LargeValue
+from django_team_events.m2m import record_m2m
+from django_team_events.sampling import AdaptiveSampler, validate_sampling
+from django_team_events.suppression import Suppressed, get_suppression
 
 SENSITIVE_FIELDS = {"password", "token", "secret", "api_key", "access_key"}
 
+# Fields of these types are reported by size instead of their full values once
+# either side reaches the threshold. None disables a type.
+LARGE_FIELD_THRESHOLDS = {
+    "TextField": 4096,
+    "JSONField": 4096,
+    "BinaryField": 1024,
+}
+
+# Large JSON is sized by walking it; past this many chars only a lower bound
+# is reported, so a huge document costs no more than this to measure.
+JSON_MEASURE_LIMIT = 65536
+
+_END = object()
+
+# Values an Event can carry as they are; DjangoJSONEncoder handles all of them.
+_PLAIN_TYPES = (
+    str, int, float, Decimal, datetime.date, datetime.time, datetime.timedelta, uuid.UUID,
+    dict, list, bytes, bytearray, memoryview, LargeValue,
+)
+
 
 class TeamEvents:
     def __init__(
@@ -10,107 +45,401 @@ class TeamEvents:
         include_fields: list = None,
         exclude_fields: list = None,
         template: dict = None,
+        large_field_thresholds: dict = None,
+        debounce: float = None,
+        debounce_max_hold: float = None,
+        skip_raw: bool = True,
+        m2m_sample_size: int = 10,
+        select_related: list = None,
+        object_repr: bool = True,
+        sampling=None,
     ):
         self.notify_on = notify_on
         self.include_fields = include_fields
         self.exclude_fields = exclude_fields
         self.template = template or {}
+        self.large_field_thresholds = {**LARGE_FIELD_THRESHOLDS, **(large_field_thresholds or {})}
+        self.skip_raw = skip_raw
+        self.m2m_sample_size = m2m_sample_size
+        self.select_related = list(select_related or ())
+        self.object_repr = object_repr
+        # None defers to the global SAMPLING setting, False disables sampling.
+        if sampling:
+            validate_sampling(sampling)
+        self.sampling = sampling
+        self._sampler = None
+        self._sampler_lock = threading.Lock()
+        self._debouncer = None
+        if debounce:
+            from django_team_events.debounce import Debouncer
+            max_hold = debounce_max_hold if debounce_max_hold is not None else debounce * 10
+            self._debouncer = Debouncer(debounce, max_hold, self._deliver)
+
+    @staticmethod
+    def suppressed(*models, summary: bool = False) -> Suppressed:
+        """Suppress notifications for the given models (or all) in this context."""
+        return Suppressed(*models, summary=summary)
 
     def __set_name__(self, owner, name):
         self.name = name
+        self.model = owner
         self._register(owner)
 
     def _register(self, model):
         pre_save.connect(self._handle_pre_save, sender=model, weak=False)
         post_save.connect(self._handle_post_save, sender=model, weak=False)
         post_delete.connect(self._handle_post_delete, sender=model, weak=False)
+        if "delete" in self.notify_on and self.object_repr:
+            pre_delete.connect(self._handle_pre_delete, sender=model, weak=False)
+        if "m2m" in self.notify_on:
+            # The through models may not exist yet, so filter inside the handler.
+            m2m_changed.connect(self._handle_m2m_changed, weak=False)
 
-    def _handle_pre_save(self, sender, instance, **kwargs):
+    def _skip(self, sender, action: str, raw: bool = False) -> bool:
+        if raw and self.skip_raw:
+            return True
+        scope = get_suppression(sender._meta.label)
+        if scope is None:
+            return False
+        if action in self.notify_on:
+            scope.record(sender._meta.label, action)
+        return True
+
+    def _handle_pre_save(self, sender, instance, raw=False, **kwargs):
+        if (raw and self.skip_raw) or get_suppression(sender._meta.label) is not None:
+            return
         if instance.pk:
+            queryset = sender.objects.all()
+            if self.select_related:
+                # Join declared relations so their labels come from this one query.
+                queryset = queryset.select_related(*self.select_related)
             try:
-                instance._pre_save_snapshot = sender.objects.get(pk=instance.pk)
+                instance._pre_save_snapshot = queryset.get(pk=instance.pk)
             except sender.DoesNotExist:
                 instance._pre_save_snapshot = None
         else:
             instance._pre_save_snapshot = None
 
-    def _handle_post_save(self, sender, instance, created, **kwargs):
-        from django_team_events.providers import google_chat
+    def _handle_post_save(self, sender, instance, created, raw=False, **kwargs):
+        # Fixture loading sets m2m data right after the raw save; the flag
+        # lets _handle_m2m_changed skip those changes too.
+        instance._team_events_raw = raw and self.skip_raw
+        if self._skip(sender, "create" if created else "update", raw):
+            return
 
         if created and "create" in self.notify_on:
-            from django_team_events.formatter import format_create
-            fields = _all_fields(instance)
+            fields = _all_fields(instance, self.large_field_thresholds)
             fields = _apply_filters(fields, self.include_fields, self.exclude_fields)
-            message = _apply_template(self.template, "create", instance, fields) \
-                or format_create(instance, fields)
-            google_chat.send(message)
+            fields.update(self._related_labels(instance, fields))
+            self._deliver(Event(
+                sender._meta.label, instance.pk, "create",
+                values=fields.items(),
+                object_repr=self._object_repr(instance),
+            ))
 
         elif not created and "update" in self.notify_on:
-            from django_team_events.formatter import format_update
             snapshot = getattr(instance, "_pre_save_snapshot", None)
-            diff = _compute_diff(snapshot, instance)
+            diff = _compute_diff(snapshot, instance, self.large_field_thresholds)
             diff = _apply_filters(diff, self.include_fields, self.exclude_fields)
             if not diff:
                 return
+            if self.select_related:
+                diff = self._label_diff(snapshot, instance, diff)
             # For update templates, expose current field values for formatting
-            fields = _all_fields(instance)
-            message = _apply_template(self.template, "update", instance, fields) \
-                or format_update(instance, diff)
-            google_chat.send(message)
+            fields = {}
+            if "update" in self.template:
+                fields = _all_fields(instance, self.large_field_thresholds)
+                fields.update(self._related_labels(instance, fields, snapshot))
+            event = Event(
+                sender._meta.label, instance.pk, "update",
+                values=fields.items(),
+                diff=((name, old, new) for name, (old, new) in diff.items()),
+            )
+            if self._debouncer is not None:
+                self._debouncer.add((event.model_label, event.pk), event)
+                return
+            self._deliver(event)
+
+    def _handle_pre_delete(self, sender, instance, **kwargs):
+        # Relations may already be gone by post_delete, so __str__ runs here.
+        if get_suppression(sender._meta.label) is None:
+            instance._team_events_repr = self._object_repr(instance)
 
     def _handle_post_delete(self, sender, instance, **kwargs):
-        if "delete" not in self.notify_on:
+        if self._debouncer is not None:
+            # Send any held update before the object's delete, not after it.
+            self._debouncer.flush_key((sender._meta.label, instance.pk))
+        if "delete" not in self.notify_on or self._skip(sender, "delete"):
             return
 
-        from django_team_events.formatter import format_delete
-        from django_team_events.providers import google_chat
-
         try:
-            fields = _all_fields(instance)
-            message = _apply_template(self.template, "delete", instance, fields) \
-                or format_delete(instance)
-            google_chat.send(message)
+            fields = {}
+            if "delete" in self.template:
+                fields = _all_fields(instance, self.large_field_thresholds)
+                fields.update(self._related_labels(instance, fields))
+            object_repr = getattr(instance, "_team_events_repr", None) or _default_repr(instance)
+            self._deliver(Event(
+                sender._meta.label, instance.pk, "delete",
+                values=fields.items(),
+                object_repr=object_repr,
+            ))
         except Exception:
             import logging
             logging.getLogger(__name__).exception(
                 "django-team-events: error handling delete event"
             )
 
+    def _deliver(self, event):
+        sampler = self._get_sampler()
+        if sampler is None or sampler.admit(event):
+            dispatch(event)
+
+    def _get_sampler(self):
+        if self._sampler is None and self.sampling is not False:
+            # Built on first use: the global setting may not be readable at import time.
+            with self._sampler_lock:
+                if self._sampler is None:
+                    options = self.sampling if self.sampling is not None else get_sampling()
+                    try:
+                        self._sampler = AdaptiveSampler(emit=dispatch, **options) if options else False
+                    except (TypeError, ValueError):
+                        # Never fail the save over a bad setting; deliver everything.
+                        import logging
+                        logging.getLogger(__name__).exception(
+                            "django-team-events: invalid sampling options %r, sampling disabled", options,
+                        )
+                        self._sampler = False
+        return self._sampler or None
+
+    def _object_repr(self, instance) -> str:
+        if not self.object_repr:
+            return _default_repr(instance)
+        try:
+            return str(instance)
+        except ObjectDoesNotExist:
+            return _default_repr(instance)
+
+    def _label_fields(self, model) -> list:
+        """Forward relations named (as first segment) in select_related."""
+        names = {path.split("__", 1)[0] for path in self.select_related}
+        return [
+            field for field in model._meta.concrete_fields
+            if field.name in names and field.is_relation and field.many_to_one
+        ]
+
+    def _related_labels(self, instance, fields: dict, snapshot=None) -> dict:
+        """Labels for declared relations in fields, from already loaded objects only."""
+        labels = {}
+        for field in self._label_fields(type(instance)):
+            if field.name not in fields:
+                continue
+            label = _related_label(field, instance)
+            if label is None and snapshot is not None:
+                if getattr(snapshot, field.attname) == getattr(instance, field.attname):
+                    label = _related_label(field, snapshot)
+            if label is not None:
+                labels[field.name] = label
+        return labels
+
+    def _label_diff(self, snapshot, instance, diff: dict) -> dict:
+        diff = dict(diff)
+        for field in self._label_fields(type(instance)):
+            if field.name not in diff:
+                continue
+            old, new = diff[field.name]
+            diff[field.name] = (
+                _related_label(field, snapshot) or old,
+                _related_label(field, instance) or new,
+            )
+        return diff
+
+    def _handle_m2m_changed(self, sender, instance, action, reverse, pk_set, using, **kwargs):
+        if reverse:
+            self._handle_reverse_m2m(sender, instance, action, pk_set, using, kwargs["model"])
+            return
+        # pre_* carries the same pk_set as post_*, so only post_* is recorded.
+        if not action.startswith("post_") or not isinstance(instance, self.model):
+            return
+        if getattr(instance, "_team_events_raw", False):
+            return
+        field = _m2m_field(self.model, sender)
+        if field is None or self._skip(type(instance), "m2m"):
+            return
+        if not _apply_filters({field.name: None}, self.include_fields, self.exclude_fields):
+            return
+        record_m2m(
+            (instance._meta.label, instance.pk, field.name, None), action, pk_set or (),
+            using, self.m2m_sample_size, self._emit_m2m,
+        )
+
+    def _handle_reverse_m2m(self, sender, instance, action, pk_set, using, model):
+        """Record a change made from the related side (tag.article_set.add(...)).
 
-def _all_fields(instance) -> dict:
+        pk_set then holds pks of this model. The whole operation becomes one
+        batch for the related object, counting and sampling those pks, so a
+        large add costs one message rather than one per row; nothing is loaded.
+        """
+        if not action.startswith("post_") or not issubclass(model, self.model):
+            return
+        field = _m2m_field(self.model, sender)
+        if field is None or self._skip(self.model, "m2m"):
+            return
+        if not _apply_filters({field.name: None}, self.include_fields, self.exclude_fields):
+            return
+        via = f"{instance._meta.object_name} #{instance.pk}"
+        record_m2m(
+            (self.model._meta.label, None, field.name, via), action, pk_set or (),
+            using, self.m2m_sample_size, self._emit_m2m,
+        )
+
+    def _emit_m2m(self, batch):
+        label, pk, _, via = batch.key
+        values = batch.values()
+        if via is not None:
+            values += (("via", via),)
+        self._deliver(Event(label, pk, "m2m", values=values))
+
+
+def _related_label(field, obj):
+    """Return "label (#id)" for obj's cached related object, or None if not loaded."""
+    value = getattr(obj, field.attname)
+    if value is None or not field.is_cached(obj):
+        return None
+    related = field.get_cached_value(obj)
+    if related is None or getattr(related, field.target_field.attname) != value:
+        return None
+    return f"{related} (#{value})"
+
+
+def _default_repr(instance) -> str:
+    return f"{type(instance).__name__} object ({instance.pk})"
+
+
+def _m2m_field(model, through):
+    for field in model._meta.many_to_many:
+        if field.remote_field.through is through:
+            return field
+    return None
+
+
+def _all_fields(instance, large_field_thresholds: dict = None) -> dict:
+    thresholds = large_field_thresholds or {}
     result = {}
     for field in instance._meta.concrete_fields:
         if field.primary_key or field.auto_created:
             continue
-        result[field.name] = getattr(instance, field.attname)
+        value = getattr(instance, field.attname)
+        threshold = thresholds.get(field.get_internal_type())
+        if threshold is not None:
+            measured = _measure(value, threshold)
+            if measured is not None and measured[1]:
+                value = measured[0]
+        result[field.name] = _plain(value)
     return result
 
 
-def _compute_diff(original, updated) -> dict:
+def _compute_diff(original, updated, large_field_thresholds: dict = None) -> dict:
     if original is None:
         return {}
 
+    thresholds = large_field_thresholds or {}
     diff = {}
     for field in updated._meta.concrete_fields:
         if field.primary_key or field.auto_created:
             continue
         old_val = getattr(original, field.attname)
         new_val = getattr(updated, field.attname)
+        threshold = thresholds.get(field.get_internal_type())
+        if threshold is not None:
+            large_change = _compare_large(old_val, new_val, threshold)
+            if large_change is not None:
+                if large_change:
+                    diff[field.name] = large_change
+                continue
         if old_val != new_val:
-            diff[field.name] = (old_val, new_val)
+            diff[field.name] = (_plain(old_val), _plain(new_val))
     return diff
 
 
-def _apply_template(template: dict, action: str, instance, fields: dict):
-    """Return formatted template string for action, or None to signal fallback."""
-    tmpl = template.get(action)
-    if tmpl is None:
-        return None
-    try:
-        return tmpl.format(**fields)
-    except (KeyError, AttributeError, TypeError):
+def _plain(value):
+    """Reduce a field value to data that holds no reference to its instance.
+
+    FieldFile keeps the model instance it belongs to, so file fields become
+    their stored name; any other non-JSON value becomes its str().
+    """
+    if value is None or isinstance(value, _PLAIN_TYPES):
+        return value
+    if isinstance(value, FieldFile):
+        return value.name or None
+    return str(value)
+
+
+def _compare_large(old_val, new_val, threshold: int):
+    """Compare two values by size, then plain equality, when either is large.
+
+    Returns None when both values are below the threshold (or cannot be
+    measured), so the caller falls back to a plain comparison. Otherwise
+    returns a (LargeValue, LargeValue) pair if the values differ, or an empty
+    tuple if they are identical.
+    """
+    old = _measure(old_val, threshold)
+    new = _measure(new_val, threshold)
+    if old is None or new is None or not (old[1] or new[1]):
         return None
 
+    old_size, new_size = old[0], new[0]
+    # A length mismatch of text or bytes settles it without touching the data;
+    # otherwise != short-circuits on the first difference. JSON sizes are
+    # estimates (1 == 1.0), so they never decide on their own.
+    sized = old_size.unit == new_size.unit and old_size.unit in ("chars", "bytes")
+    sized = sized and not isinstance(old_val, (dict, list))
+    if (sized and old_size.size != new_size.size) or old_val != new_val:
+        return (old_size, new_size)
+    return ()
+
+
+def _measure(value, threshold: int):
+    """Return (LargeValue, is_large) for value without serializing it, or None."""
+    if value is None:
+        return LargeValue(0), False
+    if isinstance(value, (bytes, bytearray, memoryview)):
+        size = memoryview(value).nbytes
+        return LargeValue(size), size >= threshold
+    if isinstance(value, str):
+        return LargeValue(len(value), "chars"), len(value) >= threshold
+    if isinstance(value, (dict, list)):
+        size, exact = _json_size(value, max(threshold, JSON_MEASURE_LIMIT))
+        return LargeValue(size, "chars", exact), size >= threshold
+    return None
+
+
+def _json_size(value, limit: int):
+    """Approximate serialized length of a JSON value, counting no further than limit.
+
+    Returns (size, exact); exact is False when the walk stopped at limit, in
+    which case size is a lower bound.
+    """
+    size = 0
+    stack = [iter((value,))]
+    while stack:
+        item = next(stack[-1], _END)
+        if item is _END:
+            stack.pop()
+            continue
+        if isinstance(item, dict):
+            size += max(2 * len(item), 1) + 1  # braces, colons and commas
+            stack.append(chain.from_iterable(item.items()))
+        elif isinstance(item, list):
+            size += max(len(item), 1) + 1  # brackets and commas
+            stack.append(iter(item))
+        elif isinstance(item, str):
+            size += len(item) + 2
+        else:
+            size += len(str(item))
+        if size >= limit:
+            return size, False
+    return size, True
+
 
 def _apply_filters(fields: dict, include_fields, exclude_fields) -> dict:
     # Step 1: fields already provided (changed or all)
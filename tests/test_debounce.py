@@ -0,0 +1,154 @@
+import itertools
+from unittest.mock import MagicMock, patch
+
+import pytest
+from django.db import connection, models
+
+from django_team_events import TeamEvents
+
+WEBHOOK_URL = "https://chat.googleapis.com/fake-webhook"
+
+_counter = itertools.count(600)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def make_model(notify_on=("update",), **team_events_kwargs):
+    model_name = f"DebounceTestModel{next(_counter)}"
+
+    class Meta:
+        app_label = "django_team_events"
+
+    team_events = TeamEvents(notify_on=list(notify_on), debounce=60, **team_events_kwargs)
+    clock = FakeClock()
+    team_events._debouncer.clock = clock
+
+    attrs = {
+        "__module__": __name__,
+        "Meta": Meta,
+        "status": models.CharField(max_length=100),
+        "count": models.IntegerField(default=0),
+        "team_events": team_events,
+    }
+    model = type(model_name, (models.Model,), attrs)
+
+    connection.disable_constraint_checking()
+    with connection.schema_editor() as editor:
+        editor.create_model(model)
+    connection.enable_constraint_checking()
+
+    return model, team_events._debouncer, clock
+
+
+@pytest.fixture
+def mock_post():
+    mock_response = MagicMock()
+    mock_response.raise_for_status.return_value = None
+
+    with patch("django_team_events.providers.google_chat.get_gchat_webhook", return_value=WEBHOOK_URL):
+        with patch("django_team_events.providers.google_chat.requests.post", return_value=mock_response) as mock_post:
+            yield mock_post
+
+
+@pytest.mark.django_db(transaction=True)
+def test_rapid_updates_are_merged_into_net_change(mock_post):
+    model, debouncer, clock = make_model()
+    instance = model.objects.create(status="queued")
+
+    for status in ("running", "finishing", "done"):
+        instance.status = status
+        instance.save()
+        clock.now += 1
+
+    mock_post.assert_not_called()
+
+    clock.now += 60
+    debouncer.flush()
+
+    mock_post.assert_called_once()
+    text = mock_post.call_args[1]["json"]["text"]
+    assert "- status: queued → done" in text
+    assert "running" not in text
+
+
+@pytest.mark.django_db(transaction=True)
+def test_debounce_waits_for_quiet_period(mock_post):
+    model, debouncer, clock = make_model()
+    instance = model.objects.create(status="queued")
+
+    instance.status = "running"
+    instance.save()
+    clock.now += 30
+    debouncer.flush()
+
+    mock_post.assert_not_called()
+
+
+@pytest.mark.django_db(transaction=True)
+def test_debounce_max_hold_reports_continuous_churn(mock_post):
+    model, debouncer, clock = make_model(debounce_max_hold=100)
+    instance = model.objects.create(status="queued", count=0)
+
+    for i in range(1, 6):
+        instance.count = i
+        instance.save()
+        clock.now += 25
+        debouncer.flush()
+
+    mock_post.assert_called_once()
+    assert "- count: 0 → 4" in mock_post.call_args[1]["json"]["text"]
+
+    debouncer.flush(force=True)
+    assert "- count: 4 → 5" in mock_post.call_args[1]["json"]["text"]
+
+
+@pytest.mark.django_db(transaction=True)
+def test_debounce_reverted_change_sends_nothing(mock_post):
+    model, debouncer, clock = make_model()
+    instance = model.objects.create(status="queued")
+
+    instance.status = "running"
+    instance.save()
+    instance.status = "queued"
+    instance.save()
+    debouncer.flush(force=True)
+
+    mock_post.assert_not_called()
+
+
+@pytest.mark.django_db(transaction=True)
+def test_debounce_keeps_objects_separate(mock_post):
+    model, debouncer, clock = make_model()
+    first = model.objects.create(status="a")
+    second = model.objects.create(status="b")
+
+    first.status = "a2"
+    first.save()
+    second.status = "b2"
+    second.save()
+    debouncer.flush(force=True)
+
+    assert mock_post.call_count == 2
+
+
+@pytest.mark.django_db(transaction=True)
+def test_held_update_sent_before_delete(mock_post):
+    model, debouncer, clock = make_model(notify_on=["update", "delete"])
+    instance = model.objects.create(status="queued")
+
+    instance.status = "running"
+    instance.save()
+    instance.delete()
+    debouncer.flush(force=True)
+
+    texts = [call[1]["json"]["text"] for call in mock_post.call_args_list]
+    assert len(texts) == 2
+    assert "Updated" in texts[0]
+    assert "- status: queued → running" in texts[0]
+    assert "Deleted" in texts[1]
@@ -0,0 +1,211 @@
+import itertools
+import pickle
+import threading
+from unittest.mock import MagicMock, patch
+
+import pytest
+from django.db import connection, models
+from django.test import override_settings
+
+from django_team_events import TeamEvents
+from django_team_events.delivery import flush
+from django_team_events.events import Event, LargeValue
+from django_team_events.formatter import render
+
+WEBHOOK_URL = "https://chat.googleapis.com/fake-webhook"
+
+_counter = itertools.count(800)
+
+
+def make_model(notify_on=("create", "update", "delete"), fields=None, **team_events_kwargs):
+    model_name = f"EventTestModel{next(_counter)}"
+
+    class Meta:
+        app_label = "django_team_events"
+
+    attrs = {
+        "__module__": __name__,
+        "Meta": Meta,
+        "name": models.CharField(max_length=100),
+        "team_events": TeamEvents(notify_on=list(notify_on), **team_events_kwargs),
+        "__str__": lambda self: self.name,
+    }
+    attrs.update(fields or {})
+    model = type(model_name, (models.Model,), attrs)
+
+    connection.disable_constraint_checking()
+    with connection.schema_editor() as editor:
+        editor.create_model(model)
+    connection.enable_constraint_checking()
+
+    return model
+
+
+def make_event(**kwargs):
+    defaults = {
+        "model_label": "shop.Order",
+        "pk": 7,
+        "action": "update",
+        "diff": [("status", "new", "paid"), ("body", LargeValue(5000, "chars"), LargeValue(6000, "chars"))],
+        "timestamp": 1700000000.0,
+    }
+    defaults.update(kwargs)
+    return Event(**defaults)
+
+
+# ---------------------------------------------------------------------------
+# Event record
+# ---------------------------------------------------------------------------
+
+def test_event_is_immutable():
+    event = make_event()
+
+    with pytest.raises(AttributeError):
+        event.pk = 8
+    with pytest.raises(AttributeError):
+        event.extra = 1
+    assert not hasattr(event, "__dict__")
+
+
+def test_event_pickle_round_trip():
+    event = make_event()
+
+    assert pickle.loads(pickle.dumps(event)) == event
+
+
+def test_event_with_memoryview_pickles():
+    event = make_event(values=[("blob", memoryview(b"\x00" * 64))])
+
+    restored = pickle.loads(pickle.dumps(event))
+
+    assert restored.fields["blob"] == LargeValue(64)
+
+
+def test_event_copies_container_values():
+    data = {"tags": ["a"]}
+    event = make_event(values=[("data", data)], diff=[("data", {"tags": []}, data)])
+
+    data["tags"].append("b")
+
+    assert event.fields["data"] == {"tags": ["a"]}
+    assert event.changes["data"][1] == {"tags": ["a"]}
+
+
+def test_event_json_round_trip():
+    event = make_event(values=[("name", "Alice")], object_repr="Order 7")
+
+    restored = Event.from_json(event.to_json())
+
+    assert restored == event
+    assert isinstance(restored.changes["body"][0], LargeValue)
+
+
+def test_event_json_keeps_inexact_large_value():
+    event = make_event(values=[("data", LargeValue(65536, "chars", exact=False))])
+
+    assert Event.from_json(event.to_json()).fields["data"] == LargeValue(65536, "chars", exact=False)
+
+
+def test_event_json_reads_two_element_large_marker():
+    data = {**make_event().to_dict(), "values": [["data", {"__large__": [10, "chars"]}]]}
+
+    assert Event.from_dict(data).fields["data"] == LargeValue(10, "chars")
+
+
+def test_event_replace_returns_new_event():
+    event = make_event()
+
+    replaced = event.replace(pk=8)
+
+    assert replaced.pk == 8
+    assert event.pk == 7
+
+
+def test_render_update_from_event():
+    text = render(make_event())
+
+    assert text.startswith("✏️ [Order] Updated\nID: 7\n")
+    assert "- status: new → paid" in text
+    assert "- body: <5000 chars> → <6000 chars>" in text
+
+
+# ---------------------------------------------------------------------------
+# Capture
+# ---------------------------------------------------------------------------
+
+@pytest.mark.django_db(transaction=True)
+def test_handlers_capture_events_without_instances():
+    model = make_model()
+    captured = []
+
+    with patch("django_team_events.team_events.dispatch", side_effect=captured.append):
+        instance = model.objects.create(name="Alice")
+        instance.name = "Bob"
+        instance.save()
+        instance.delete()
+
+    assert [e.action for e in captured] == ["create", "update", "delete"]
+    for event in captured:
+        assert event.model_label == model._meta.label
+        assert not any(isinstance(v, models.Model) for _, v in event.values)
+        pickle.dumps(event)
+    assert captured[0].object_repr == "Alice"
+    assert captured[1].diff == (("name", "Alice", "Bob"),)
+
+
+@pytest.mark.django_db(transaction=True)
+def test_create_event_is_compact():
+    model = make_model(notify_on=["create"], fields={"body": models.TextField()})
+    captured = []
+
+    with patch("django_team_events.team_events.dispatch", side_effect=captured.append):
+        model.objects.create(name="Alice", body="x" * 100000)
+
+    assert captured[0].fields["body"] == LargeValue(100000, "chars")
+    assert captured[0].fields["name"] == "Alice"
+
+
+@pytest.mark.django_db(transaction=True)
+def test_file_field_captured_as_name():
+    model = make_model(notify_on=["create", "update"], fields={"doc": models.FileField(blank=True)})
+    captured = []
+
+    with patch("django_team_events.team_events.dispatch", side_effect=captured.append):
+        instance = model.objects.create(name="Alice", doc="docs/a.txt")
+        instance.doc = "docs/b.txt"
+        instance.save()
+        model.objects.create(name="Bob")
+
+    created, updated, empty = captured
+    assert created.fields["doc"] == "docs/a.txt"
+    assert updated.changes["doc"] == ("docs/a.txt", "docs/b.txt")
+    assert empty.fields["doc"] is None
+    for event in captured:
+        assert Event.from_json(event.to_json()) == event
+        assert pickle.loads(pickle.dumps(event)) == event
+
+
+# ---------------------------------------------------------------------------
+# Threaded delivery
+# ---------------------------------------------------------------------------
+
+@pytest.mark.django_db(transaction=True)
+def test_thread_delivery_renders_and_sends_off_request_thread():
+    model = make_model(notify_on=["create"], template={"create": "New: {name}"})
+    threads = []
+
+    def fake_post(*args, **kwargs):
+        threads.append(threading.current_thread())
+        response = MagicMock()
+        response.raise_for_status.return_value = None
+        return response
+
+    with override_settings(DJANGO_TEAM_EVENTS={"DELIVERY": "thread"}):
+        with patch("django_team_events.providers.google_chat.get_gchat_webhook", return_value=WEBHOOK_URL):
+            with patch("django_team_events.providers.google_chat.requests.post", side_effect=fake_post) as mock_post:
+                model.objects.create(name="Alice")
+                flush()
+
+    mock_post.assert_called_once()
+    assert mock_post.call_args[1]["json"]["text"] == "New: Alice"
+    assert threads[0] is not threading.current_thread()
@@ -0,0 +1,172 @@
+import itertools
+from unittest.mock import MagicMock, patch
+
+import pytest
+from django.db import connection, models
+
+from django_team_events import TeamEvents
+from django_team_events.team_events import _json_size
+
+WEBHOOK_URL = "https://chat.googleapis.com/fake-webhook"
+
+_counter = itertools.count(500)
+
+
+def make_model(fields, **team_events_kwargs):
+    model_name = f"LargeFieldTestModel{next(_counter)}"
+
+    class Meta:
+        app_label = "django_team_events"
+
+    attrs = {
+        "__module__": __name__,
+        "Meta": Meta,
+        "name": models.CharField(max_length=100),
+        "team_events": TeamEvents(notify_on=["update"], **team_events_kwargs),
+    }
+    attrs.update(fields)
+    model = type(model_name, (models.Model,), attrs)
+
+    connection.disable_constraint_checking()
+    with connection.schema_editor() as editor:
+        editor.create_model(model)
+    connection.enable_constraint_checking()
+
+    return model
+
+
+def save_and_capture(instance):
+    mock_response = MagicMock()
+    mock_response.raise_for_status.return_value = None
+
+    with patch("django_team_events.providers.google_chat.get_gchat_webhook", return_value=WEBHOOK_URL):
+        with patch("django_team_events.providers.google_chat.requests.post", return_value=mock_response) as mock_post:
+            instance.save()
+    return mock_post
+
+
+@pytest.mark.django_db(transaction=True)
+def test_large_text_change_reported_by_size():
+    model = make_model({"body": models.TextField()})
+    instance = model.objects.create(name="doc", body="a" * 5000)
+
+    instance.body = "b" * 6000
+    mock_post = save_and_capture(instance)
+
+    mock_post.assert_called_once()
+    text = mock_post.call_args[1]["json"]["text"]
+    assert "- body: <5000 chars> → <6000 chars>" in text
+    assert "aaaa" not in text
+    assert "bbbb" not in text
+
+
+@pytest.mark.django_db(transaction=True)
+def test_large_text_same_length_change_detected():
+    model = make_model({"body": models.TextField()})
+    instance = model.objects.create(name="doc", body="a" * 5000)
+
+    instance.body = "a" * 4999 + "b"
+    mock_post = save_and_capture(instance)
+
+    mock_post.assert_called_once()
+    assert "<5000 chars> → <5000 chars>" in mock_post.call_args[1]["json"]["text"]
+
+
+@pytest.mark.django_db(transaction=True)
+def test_large_text_unchanged_sends_nothing():
+    model = make_model({"body": models.TextField()})
+    instance = model.objects.create(name="doc", body="a" * 5000)
+
+    mock_post = save_and_capture(instance)
+
+    mock_post.assert_not_called()
+
+
+@pytest.mark.django_db(transaction=True)
+def test_large_json_change_reported_by_size():
+    model = make_model({"data": models.JSONField()})
+    instance = model.objects.create(name="doc", data={"items": list(range(2000))})
+
+    instance.data = {"items": list(range(2001))}
+    mock_post = save_and_capture(instance)
+
+    mock_post.assert_called_once()
+    text = mock_post.call_args[1]["json"]["text"]
+    assert "- data: <8901 chars> → <8906 chars>" in text
+    assert "1999" not in text
+
+
+@pytest.mark.django_db(transaction=True)
+def test_large_json_key_order_is_not_a_change():
+    model = make_model({"data": models.JSONField()})
+    payload = {f"key{i}": "x" * 50 for i in range(100)}
+    instance = model.objects.create(name="doc", data=payload)
+
+    instance.data = dict(reversed(list(payload.items())))
+    mock_post = save_and_capture(instance)
+
+    mock_post.assert_not_called()
+
+
+@pytest.mark.django_db(transaction=True)
+def test_small_text_change_keeps_full_values():
+    model = make_model({"body": models.TextField()})
+    instance = model.objects.create(name="doc", body="short")
+
+    instance.body = "longer"
+    mock_post = save_and_capture(instance)
+
+    assert "- body: short → longer" in mock_post.call_args[1]["json"]["text"]
+
+
+@pytest.mark.django_db(transaction=True)
+def test_large_field_threshold_is_configurable():
+    model = make_model(
+        {"body": models.TextField()},
+        large_field_thresholds={"TextField": 3},
+    )
+    instance = model.objects.create(name="doc", body="short")
+
+    instance.body = "longer"
+    mock_post = save_and_capture(instance)
+
+    assert "- body: <5 chars> → <6 chars>" in mock_post.call_args[1]["json"]["text"]
+
+
+@pytest.mark.django_db(transaction=True)
+def test_large_field_threshold_can_be_disabled():
+    model = make_model(
+        {"body": models.TextField()},
+        large_field_thresholds={"TextField": None},
+    )
+    instance = model.objects.create(name="doc", body="a" * 5000)
+
+    instance.body = "b" * 5000
+    mock_post = save_and_capture(instance)
+
+    assert "aaaa" in mock_post.call_args[1]["json"]["text"]
+
+
+class Scalar:
+    """JSON scalar stand-in that counts how often it is measured."""
+
+    measured = 0
+
+    def __str__(self):
+        Scalar.measured += 1
+        return "12345"
+
+
+def test_json_size_stops_at_limit_in_wide_containers():
+    Scalar.measured = 0
+
+    size, exact = _json_size({"rows": [Scalar() for _ in range(100000)]}, 100)
+
+    assert not exact
+    assert size >= 100
+    assert Scalar.measured < 20
+
+
+def test_json_size_of_small_document_is_exact():
+    assert _json_size({"a": [1, "xy"]}, 100) == (len('{"a":[1,"xy"]}'), True)
+
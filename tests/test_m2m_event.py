@@ -0,0 +1,263 @@
+import itertools
+from unittest.mock import MagicMock, patch
+
+import pytest
+from django.core import serializers
+from django.db import connection, models, transaction
+from django.test.utils import CaptureQueriesContext
+
+from django_team_events import TeamEvents
+
+WEBHOOK_URL = "https://chat.googleapis.com/fake-webhook"
+
+_counter = itertools.count(900)
+
+
+def create_table(model):
+    connection.disable_constraint_checking()
+    with connection.schema_editor() as editor:
+        editor.create_model(model)
+    connection.enable_constraint_checking()
+
+
+def make_models(notify_on=("m2m",), **team_events_kwargs):
+    n = next(_counter)
+
+    class TagMeta:
+        app_label = "django_team_events"
+
+    tag = type(f"M2MTag{n}", (models.Model,), {
+        "__module__": __name__,
+        "Meta": TagMeta,
+        "label": models.CharField(max_length=100),
+    })
+
+    class Meta:
+        app_label = "django_team_events"
+
+    article = type(f"M2MArticle{n}", (models.Model,), {
+        "__module__": __name__,
+        "Meta": Meta,
+        "title": models.CharField(max_length=100),
+        "tags": models.ManyToManyField(tag, related_name="articles"),
+        "team_events": TeamEvents(notify_on=list(notify_on), **team_events_kwargs),
+    })
+
+    create_table(tag)
+    create_table(article)
+    return article, tag
+
+
+@pytest.fixture
+def mock_post():
+    mock_response = MagicMock()
+    mock_response.raise_for_status.return_value = None
+
+    with patch("django_team_events.providers.google_chat.get_gchat_webhook", return_value=WEBHOOK_URL):
+        with patch("django_team_events.providers.google_chat.requests.post", return_value=mock_response) as mock_post:
+            yield mock_post
+
+
+def sent_text(mock_post):
+    return mock_post.call_args[1]["json"]["text"]
+
+
+@pytest.mark.django_db(transaction=True)
+def test_m2m_add_sends_one_event_with_count_and_sample(mock_post):
+    article_model, tag_model = make_models()
+    article = article_model.objects.create(title="Post")
+    tags = tag_model.objects.bulk_create([tag_model(label=f"t{i}") for i in range(25)])
+
+    article.tags.add(*tags)
+
+    mock_post.assert_called_once()
+    text = sent_text(mock_post)
+    assert f"[{article_model.__name__}] tags changed" in text
+    assert f"ID: {article.pk}" in text
+    assert "- added: 25 (" in text
+    assert "… +15 more)" in text
+
+
+@pytest.mark.django_db(transaction=True)
+def test_m2m_set_merges_remove_and_add(mock_post):
+    article_model, tag_model = make_models()
+    article = article_model.objects.create(title="Post")
+    tags = tag_model.objects.bulk_create([tag_model(label=f"t{i}") for i in range(4)])
+    article.tags.add(tags[0], tags[1])
+    mock_post.reset_mock()
+
+    article.tags.set([tags[1].pk, tags[2].pk, tags[3].pk])
+
+    mock_post.assert_called_once()
+    text = sent_text(mock_post)
+    assert f"- added: 2 ({tags[2].pk}, {tags[3].pk})" in text
+    assert f"- removed: 1 ({tags[0].pk})" in text
+
+
+@pytest.mark.django_db(transaction=True)
+def test_m2m_changes_in_one_transaction_are_batched(mock_post):
+    article_model, tag_model = make_models()
+    article = article_model.objects.create(title="Post")
+    tags = tag_model.objects.bulk_create([tag_model(label=f"t{i}") for i in range(3)])
+
+    with transaction.atomic():
+        for tag in tags:
+            article.tags.add(tag)
+        mock_post.assert_not_called()
+
+    mock_post.assert_called_once()
+    assert "- added: 3" in sent_text(mock_post)
+
+
+@pytest.mark.django_db(transaction=True)
+def test_m2m_clear(mock_post):
+    article_model, tag_model = make_models()
+    article = article_model.objects.create(title="Post")
+    article.tags.add(tag_model.objects.create(label="t"))
+    mock_post.reset_mock()
+
+    article.tags.clear()
+
+    mock_post.assert_called_once()
+    assert "- cleared" in sent_text(mock_post)
+
+
+@pytest.mark.django_db(transaction=True)
+def test_m2m_rolled_back_changes_are_not_reported(mock_post):
+    article_model, tag_model = make_models()
+    article = article_model.objects.create(title="Post")
+    tags = tag_model.objects.bulk_create([tag_model(label=f"t{i}") for i in range(2)])
+
+    with pytest.raises(RuntimeError):
+        with transaction.atomic():
+            article.tags.add(tags[0])
+            raise RuntimeError
+
+    article.tags.add(tags[1])
+
+    mock_post.assert_called_once()
+    assert f"- added: 1 ({tags[1].pk})" in sent_text(mock_post)
+
+
+@pytest.mark.django_db(transaction=True)
+def test_m2m_tracking_adds_no_queries(mock_post):
+    tracked_model, tag_model = make_models()
+    untracked_model, untracked_tag_model = make_models(notify_on=["create"])
+    tracked = tracked_model.objects.create(title="Post")
+    untracked = untracked_model.objects.create(title="Post")
+    tag_ids = [t.pk for t in tag_model.objects.bulk_create([tag_model(label=f"t{i}") for i in range(50)])]
+    untracked_tag_ids = [
+        t.pk for t in untracked_tag_model.objects.bulk_create([untracked_tag_model(label=f"t{i}") for i in range(50)])
+    ]
+
+    with CaptureQueriesContext(connection) as tracked_queries:
+        tracked.tags.set(tag_ids)
+    with CaptureQueriesContext(connection) as untracked_queries:
+        untracked.tags.set(untracked_tag_ids)
+
+    assert len(tracked_queries) == len(untracked_queries)
+
+    with CaptureQueriesContext(connection) as tracked_queries:
+        tag_model.objects.get(pk=tag_ids[0]).articles.add(tracked_model.objects.create(title="Other"))
+    with CaptureQueriesContext(connection) as untracked_queries:
+        untracked_tag_model.objects.get(pk=untracked_tag_ids[0]).articles.add(
+            untracked_model.objects.create(title="Other")
+        )
+
+    assert len(tracked_queries) == len(untracked_queries)
+
+
+@pytest.mark.django_db(transaction=True)
+def test_m2m_not_tracked_unless_in_notify_on(mock_post):
+    article_model, tag_model = make_models(notify_on=["update"])
+    article = article_model.objects.create(title="Post")
+
+    article.tags.add(tag_model.objects.create(label="t"))
+
+    mock_post.assert_not_called()
+
+
+@pytest.mark.django_db(transaction=True)
+def test_m2m_excluded_field_not_reported(mock_post):
+    article_model, tag_model = make_models(exclude_fields=["tags"])
+    article = article_model.objects.create(title="Post")
+
+    article.tags.add(tag_model.objects.create(label="t"))
+
+    mock_post.assert_not_called()
+
+
+@pytest.mark.django_db(transaction=True)
+def test_m2m_reverse_add_sends_one_message(mock_post):
+    article_model, tag_model = make_models()
+    articles = article_model.objects.bulk_create([article_model(title=f"a{i}") for i in range(500)])
+    tag = tag_model.objects.create(label="t")
+
+    tag.articles.add(*articles)
+
+    mock_post.assert_called_once()
+    text = sent_text(mock_post)
+    assert f"[{article_model.__name__}] tags changed" in text
+    assert f"Via: {tag_model.__name__} #{tag.pk}" in text
+    assert f"- added: 500 ({articles[0].pk}, " in text
+    assert "… +490 more)" in text
+
+
+@pytest.mark.django_db(transaction=True)
+def test_m2m_reverse_remove_and_clear(mock_post):
+    article_model, tag_model = make_models()
+    first = article_model.objects.create(title="First")
+    second = article_model.objects.create(title="Second")
+    tag = tag_model.objects.create(label="t")
+    tag.articles.add(first, second)
+    mock_post.reset_mock()
+
+    tag.articles.remove(first)
+    assert mock_post.call_count == 1
+    assert f"- removed: 1 ({first.pk})" in sent_text(mock_post)
+
+    tag.articles.clear()
+    assert mock_post.call_count == 2
+    assert "- cleared" in sent_text(mock_post)
+
+
+@pytest.mark.django_db(transaction=True)
+def test_m2m_reverse_change_respects_excluded_field(mock_post):
+    article_model, tag_model = make_models(exclude_fields=["tags"])
+    article = article_model.objects.create(title="Post")
+
+    tag_model.objects.create(label="t").articles.add(article)
+
+    mock_post.assert_not_called()
+
+
+def load_fixture(article_model, tag):
+    data = [{
+        "model": article_model._meta.label_lower,
+        "pk": 1,
+        "fields": {"title": "Loaded", "tags": [tag.pk]},
+    }]
+    for obj in serializers.deserialize("python", data):
+        obj.save()
+
+
+@pytest.mark.django_db(transaction=True)
+def test_m2m_from_loaded_fixture_not_reported(mock_post):
+    article_model, tag_model = make_models()
+    tag = tag_model.objects.create(label="t")
+
+    load_fixture(article_model, tag)
+
+    assert list(article_model.objects.get(pk=1).tags.all()) == [tag]
+    mock_post.assert_not_called()
+
+
+@pytest.mark.django_db(transaction=True)
+def test_m2m_from_loaded_fixture_reported_without_skip_raw(mock_post):
+    article_model, tag_model = make_models(skip_raw=False)
+    tag = tag_model.objects.create(label="t")
+
+    load_fixture(article_model, tag)
+
+    mock_post.assert_called_once()
+    assert "- added: 1" in sent_text(mock_post)
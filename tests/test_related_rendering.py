@@ -0,0 +1,139 @@
+import itertools
+from unittest.mock import MagicMock, patch
+
+import pytest
+from django.db import connection, models
+from django.test.utils import CaptureQueriesContext
+
+from django_team_events import TeamEvents
+
+WEBHOOK_URL = "https://chat.googleapis.com/fake-webhook"
+
+_counter = itertools.count(1200)
+
+
+def create_table(model):
+    connection.disable_constraint_checking()
+    with connection.schema_editor() as editor:
+        editor.create_model(model)
+    connection.enable_constraint_checking()
+
+
+def make_models(notify_on=("create", "update", "delete"), **team_events_kwargs):
+    n = next(_counter)
+
+    class OwnerMeta:
+        app_label = "django_team_events"
+
+    owner = type(f"RelatedOwner{n}", (models.Model,), {
+        "__module__": __name__,
+        "Meta": OwnerMeta,
+        "name": models.CharField(max_length=100),
+        "__str__": lambda self: self.name,
+    })
+
+    class Meta:
+        app_label = "django_team_events"
+
+    project = type(f"RelatedProject{n}", (models.Model,), {
+        "__module__": __name__,
+        "Meta": Meta,
+        "title": models.CharField(max_length=100),
+        "owner": models.ForeignKey(owner, on_delete=models.CASCADE),
+        "team_events": TeamEvents(notify_on=list(notify_on), **team_events_kwargs),
+        "__str__": lambda self: f"{self.title} by {self.owner}",
+    })
+
+    create_table(owner)
+    create_table(project)
+    return project, owner
+
+
+@pytest.fixture
+def mock_post():
+    mock_response = MagicMock()
+    mock_response.raise_for_status.return_value = None
+
+    with patch("django_team_events.providers.google_chat.get_gchat_webhook", return_value=WEBHOOK_URL):
+        with patch("django_team_events.providers.google_chat.requests.post", return_value=mock_response) as mock_post:
+            yield mock_post
+
+
+def sent_text(mock_post):
+    return mock_post.call_args[1]["json"]["text"]
+
+
+@pytest.mark.django_db(transaction=True)
+def test_fk_rendered_by_id_without_queries(mock_post):
+    project_model, owner_model = make_models(notify_on=["update"])
+    alice = owner_model.objects.create(name="Alice")
+    bob = owner_model.objects.create(name="Bob")
+    project = project_model.objects.create(title="Apollo", owner=alice)
+    project = project_model.objects.get(pk=project.pk)
+
+    project.owner_id = bob.pk
+    with CaptureQueriesContext(connection) as queries:
+        project.save()
+
+    assert f"- owner: {alice.pk} → {bob.pk}" in sent_text(mock_post)
+    assert len(queries) == 2  # snapshot + UPDATE
+
+
+@pytest.mark.django_db(transaction=True)
+def test_select_related_labels_loaded_in_snapshot_query(mock_post):
+    project_model, owner_model = make_models(notify_on=["update"], select_related=["owner"])
+    alice = owner_model.objects.create(name="Alice")
+    bob = owner_model.objects.create(name="Bob")
+    project = project_model.objects.create(title="Apollo", owner=alice)
+
+    project.owner = bob
+    with CaptureQueriesContext(connection) as queries:
+        project.save()
+
+    assert f"- owner: Alice (#{alice.pk}) → Bob (#{bob.pk})" in sent_text(mock_post)
+    assert len(queries) == 2
+    assert "JOIN" in queries[0]["sql"]
+
+
+@pytest.mark.django_db(transaction=True)
+def test_select_related_label_reused_for_unchanged_relation(mock_post):
+    project_model, owner_model = make_models(
+        notify_on=["update"],
+        select_related=["owner"],
+        template={"update": "{title} owned by {owner}"},
+    )
+    alice = owner_model.objects.create(name="Alice")
+    project = project_model.objects.create(title="Apollo", owner=alice)
+    project = project_model.objects.get(pk=project.pk)
+
+    project.title = "Artemis"
+    with CaptureQueriesContext(connection) as queries:
+        project.save()
+
+    assert sent_text(mock_post) == f"Artemis owned by Alice (#{alice.pk})"
+    assert len(queries) == 2
+
+
+@pytest.mark.django_db(transaction=True)
+def test_object_repr_disabled_skips_str(mock_post):
+    project_model, owner_model = make_models(notify_on=["create"], object_repr=False)
+    alice = owner_model.objects.create(name="Alice")
+    alice = owner_model.objects.get(pk=alice.pk)
+
+    with CaptureQueriesContext(connection) as queries:
+        project = project_model.objects.create(title="Apollo", owner_id=alice.pk)
+
+    assert f"Object: {project_model.__name__} object ({project.pk})" in sent_text(mock_post)
+    assert len(queries) == 1
+
+
+@pytest.mark.django_db(transaction=True)
+def test_delete_repr_captured_before_relations_are_deleted(mock_post):
+    project_model, owner_model = make_models(notify_on=["delete"])
+    alice = owner_model.objects.create(name="Alice")
+    project_model.objects.create(title="Apollo", owner=alice)
+
+    alice.delete()
+
+    mock_post.assert_called_once()
+    assert "Object: Apollo by Alice" in sent_text(mock_post)
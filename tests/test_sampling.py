@@ -0,0 +1,220 @@
+import itertools
+from unittest.mock import MagicMock, patch
+
+import pytest
+from django.apps import apps
+from django.core.exceptions import ImproperlyConfigured
+from django.db import connection, models
+from django.test import override_settings
+
+from django_team_events import TeamEvents
+from django_team_events.events import Event
+from django_team_events.sampling import AdaptiveSampler, validate_sampling
+
+WEBHOOK_URL = "https://chat.googleapis.com/fake-webhook"
+
+_counter = itertools.count(1300)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def make_model(**team_events_kwargs):
+    model_name = f"SamplingTestModel{next(_counter)}"
+
+    class Meta:
+        app_label = "django_team_events"
+
+    attrs = {
+        "__module__": __name__,
+        "Meta": Meta,
+        "name": models.CharField(max_length=100),
+        "team_events": TeamEvents(notify_on=["create"], **team_events_kwargs),
+    }
+    model = type(model_name, (models.Model,), attrs)
+
+    connection.disable_constraint_checking()
+    with connection.schema_editor() as editor:
+        editor.create_model(model)
+    connection.enable_constraint_checking()
+
+    return model
+
+
+def make_sampler(**kwargs):
+    emitted = []
+    clock = FakeClock()
+    options = {"threshold": 1.0, "window": 10.0, "every": 4}
+    options.update(kwargs)
+    sampler = AdaptiveSampler(emit=emitted.append, clock=clock, **options)
+    return sampler, clock, emitted
+
+
+def event(action="create"):
+    return Event("shop.Order", 1, action)
+
+
+# ---------------------------------------------------------------------------
+# AdaptiveSampler
+# ---------------------------------------------------------------------------
+
+def test_full_delivery_below_threshold():
+    sampler, clock, emitted = make_sampler()
+
+    admitted = []
+    for _ in range(20):
+        admitted.append(sampler.admit(event()))
+        clock.now += 2  # 0.5 events per second
+
+    assert all(admitted)
+    assert not sampler.sampling
+
+
+def test_every_nth_sampling_above_threshold():
+    sampler, clock, emitted = make_sampler()
+
+    admitted = [sampler.admit(event()) for _ in range(50)]
+
+    # The first 10 events fit the threshold; the rest are sampled 1 in 4.
+    assert all(admitted[:10])
+    assert admitted[10:] == [True, False, False, False] * 10
+    assert sampler.sampling
+
+
+def test_skipped_events_counted_exactly():
+    sampler, clock, emitted = make_sampler()
+
+    for action in ["create"] * 30 + ["delete"] * 20:
+        sampler.admit(event(action))
+    sampler.flush()
+
+    (summary,) = emitted
+    assert summary.action == "sampled"
+    assert summary.model_label == "shop.Order"
+    skipped = summary.fields
+    assert skipped["create"] + skipped["delete"] == 30
+    assert skipped["delete"] == 15
+
+
+def test_probabilistic_sampling():
+    rolls = iter([0.05, 0.5, 0.9, 0.01] * 20)
+    sampler, clock, emitted = make_sampler(mode="probabilistic", probability=0.1, rand=lambda: next(rolls))
+
+    admitted = [sampler.admit(event()) for _ in range(30)]
+
+    assert admitted[10:] == [True, False, False, True] * 5
+
+
+def test_returns_to_full_delivery_and_reports_skipped():
+    sampler, clock, emitted = make_sampler()
+    for _ in range(30):
+        sampler.admit(event())
+    assert sampler.sampling
+
+    clock.now += 25
+    assert sampler.admit(event())
+
+    assert not sampler.sampling
+    (summary,) = emitted
+    assert summary.fields["create"] == 15
+
+
+def test_unknown_mode_rejected():
+    with pytest.raises(ValueError):
+        AdaptiveSampler(threshold=1, emit=print, mode="sometimes")
+
+
+@pytest.mark.parametrize("options", [
+    {"window": 10},
+    {"threshold": 1, "mode": "sometimes"},
+    {"threshold": 1, "evrey": 10},
+    {"threshold": 1, "every": 0},
+    {"threshold": 1, "window": 0},
+    {"threshold": 1, "probability": 2},
+    {"threshold": "5"},
+    [("threshold", 1)],
+])
+def test_invalid_sampling_options_rejected(options):
+    with pytest.raises(ValueError):
+        validate_sampling(options)
+
+
+def test_invalid_model_sampling_rejected_at_definition():
+    with pytest.raises(ValueError, match="evrey"):
+        TeamEvents(notify_on=["create"], sampling={"threshold": 1, "evrey": 10})
+
+
+def test_invalid_global_sampling_rejected_at_startup():
+    with override_settings(DJANGO_TEAM_EVENTS={"SAMPLING": {"threshold": 1, "mode": "sometimes"}}):
+        with pytest.raises(ImproperlyConfigured, match="SAMPLING"):
+            apps.get_app_config("django_team_events").ready()
+
+
+# ---------------------------------------------------------------------------
+# TeamEvents integration
+# ---------------------------------------------------------------------------
+
+@pytest.fixture
+def mock_post():
+    mock_response = MagicMock()
+    mock_response.raise_for_status.return_value = None
+
+    with patch("django_team_events.providers.google_chat.get_gchat_webhook", return_value=WEBHOOK_URL):
+        with patch("django_team_events.providers.google_chat.requests.post", return_value=mock_response) as mock_post:
+            yield mock_post
+
+
+@pytest.mark.django_db(transaction=True)
+def test_event_storm_is_sampled_with_summary(mock_post):
+    model = make_model(sampling={"threshold": 1, "window": 60, "every": 10})
+
+    for i in range(200):
+        model.objects.create(name=f"row{i}")
+    sent = mock_post.call_count
+    model.team_events._get_sampler().flush()
+
+    texts = [call[1]["json"]["text"] for call in mock_post.call_args_list]
+    assert sent == 60 + 14
+    assert f"[{model.__name__}] 126 more events suppressed by sampling" in texts[-1]
+
+
+@pytest.mark.django_db(transaction=True)
+def test_global_sampling_setting(mock_post):
+    model = make_model()
+
+    with override_settings(DJANGO_TEAM_EVENTS={"SAMPLING": {"threshold": 0.1, "window": 60, "every": 1000}}):
+        for i in range(20):
+            model.objects.create(name=f"row{i}")
+        sampler = model.team_events._get_sampler()
+
+    assert mock_post.call_count == 7
+    sampler.flush()
+    assert "13 more events suppressed" in mock_post.call_args[1]["json"]["text"]
+
+
+@pytest.mark.django_db(transaction=True)
+def test_sampling_disabled_per_model(mock_post):
+    model = make_model(sampling=False)
+
+    with override_settings(DJANGO_TEAM_EVENTS={"SAMPLING": {"threshold": 0.1}}):
+        for i in range(20):
+            model.objects.create(name=f"row{i}")
+
+    assert mock_post.call_count == 20
+
+
+@pytest.mark.django_db(transaction=True)
+def test_invalid_global_sampling_falls_back_to_full_delivery(mock_post, caplog):
+    model = make_model()
+
+    with override_settings(DJANGO_TEAM_EVENTS={"SAMPLING": {"threshold": 0.1, "evrey": 10}}):
+        for i in range(5):
+            model.objects.create(name=f"row{i}")
+
+    assert mock_post.call_count == 5
+    assert "invalid sampling options" in caplog.text
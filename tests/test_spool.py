@@ -0,0 +1,286 @@
+import itertools
+import json
+import os
+from io import StringIO
+from unittest.mock import MagicMock, patch
+
+import pytest
+from django.core.management import CommandError, call_command
+from django.db import connection, models
+from django.test import override_settings
+
+from django_team_events import TeamEvents
+from django_team_events.events import Event
+from django_team_events.spool import CHECKPOINT_NAME, SpoolSender, SpoolWriter
+
+WEBHOOK_URL = "https://chat.googleapis.com/fake-webhook"
+
+_counter = itertools.count(1000)
+
+
+def make_model(**team_events_kwargs):
+    model_name = f"SpoolTestModel{next(_counter)}"
+
+    class Meta:
+        app_label = "django_team_events"
+
+    attrs = {
+        "__module__": __name__,
+        "Meta": Meta,
+        "name": models.CharField(max_length=100),
+        "team_events": TeamEvents(notify_on=["create", "update"], **team_events_kwargs),
+        "__str__": lambda self: self.name,
+    }
+    model = type(model_name, (models.Model,), attrs)
+
+    connection.disable_constraint_checking()
+    with connection.schema_editor() as editor:
+        editor.create_model(model)
+    connection.enable_constraint_checking()
+
+    return model
+
+
+def spool_settings(spool_dir):
+    return override_settings(DJANGO_TEAM_EVENTS={
+        "GCHAT_WEBHOOK": WEBHOOK_URL,
+        "DELIVERY": "spool",
+        "SPOOL_DIR": str(spool_dir),
+    })
+
+
+def make_event(pk, name="x"):
+    return Event("shop.Order", pk, "create", values=[("name", name)], object_repr=f"Order {pk}")
+
+
+def spooled_lines(spool_dir):
+    lines = []
+    for name in sorted(os.listdir(spool_dir)):
+        if name.endswith(".jsonl"):
+            with open(spool_dir / name) as f:
+                lines.extend(f.read().splitlines())
+    return lines
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps = []
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+# ---------------------------------------------------------------------------
+# Writing
+# ---------------------------------------------------------------------------
+
+@pytest.mark.django_db(transaction=True)
+def test_spool_mode_appends_events_instead_of_posting(tmp_path):
+    model = make_model()
+
+    with spool_settings(tmp_path):
+        with patch("django_team_events.providers.google_chat.requests.post") as mock_post:
+            instance = model.objects.create(name="Alice")
+            instance.name = "Bob"
+            instance.save()
+
+    mock_post.assert_not_called()
+    lines = spooled_lines(tmp_path)
+    assert [json.loads(line)["action"] for line in lines] == ["create", "update"]
+
+
+def test_writer_appends_whole_lines(tmp_path):
+    writer = SpoolWriter()
+    for pk in range(3):
+        writer.append(str(tmp_path), 300, make_event(pk))
+    writer.close()
+
+    lines = spooled_lines(tmp_path)
+    assert [Event.from_json(line).pk for line in lines] == [0, 1, 2]
+
+
+# ---------------------------------------------------------------------------
+# Sending
+# ---------------------------------------------------------------------------
+
+def test_sender_batches_events_into_one_message(tmp_path):
+    writer = SpoolWriter()
+    for pk in range(3):
+        writer.append(str(tmp_path), 300, make_event(pk))
+    writer.close()
+    send = MagicMock(return_value=True)
+
+    consumed = SpoolSender(str(tmp_path), send=send).run_once()
+
+    assert consumed == 3
+    send.assert_called_once()
+    message = send.call_args[0][0]
+    assert all(f"Object: Order {pk}" in message for pk in range(3))
+
+
+def test_sender_checkpoints_and_resumes(tmp_path):
+    writer = SpoolWriter()
+    writer.append(str(tmp_path), 300, make_event(1))
+    send = MagicMock(return_value=True)
+
+    SpoolSender(str(tmp_path), send=send).run_once()
+    writer.append(str(tmp_path), 300, make_event(2))
+    writer.close()
+
+    # A fresh sender (e.g. after a restart) only delivers what is new.
+    SpoolSender(str(tmp_path), send=send).run_once()
+
+    assert send.call_count == 2
+    assert "Order 2" in send.call_args[0][0]
+    assert "Order 1" not in send.call_args[0][0]
+    assert os.path.exists(tmp_path / CHECKPOINT_NAME)
+
+
+def test_sender_does_not_advance_on_failed_send(tmp_path):
+    writer = SpoolWriter()
+    writer.append(str(tmp_path), 300, make_event(1))
+    writer.close()
+
+    failing = MagicMock(return_value=False)
+    assert SpoolSender(str(tmp_path), send=failing).run_once() == 0
+
+    send = MagicMock(return_value=True)
+    assert SpoolSender(str(tmp_path), send=send).run_once() == 1
+    assert "Order 1" in send.call_args[0][0]
+
+
+def test_sender_ignores_partial_trailing_line(tmp_path):
+    writer = SpoolWriter()
+    writer.append(str(tmp_path), 300, make_event(1))
+    writer.close()
+    (segment,) = [n for n in os.listdir(tmp_path) if n.endswith(".jsonl")]
+    with open(tmp_path / segment, "a") as f:
+        f.write('{"model_label": "shop.Order", "pk"')
+    send = MagicMock(return_value=True)
+
+    assert SpoolSender(str(tmp_path), send=send).run_once() == 1
+
+
+def test_sender_merges_workers_by_timestamp(tmp_path):
+    for pid, timestamps in ((100, (1.0, 3.0, 5.0)), (200, (2.0, 4.0))):
+        with open(tmp_path / f"000000000001-{pid}.jsonl", "w") as f:
+            for timestamp in timestamps:
+                event = Event("shop.Order", int(timestamp), "update", timestamp=timestamp)
+                f.write(event.to_json() + "\n")
+    send = MagicMock(return_value=True)
+
+    clock = FakeClock()
+
+    sender = SpoolSender(str(tmp_path), batch_size=2, send=send, clock=clock, sleep=clock.sleep)
+    while sender.run_once():
+        pass
+
+    ids = [line for call in send.call_args_list for line in call[0][0].split("\n") if line.startswith("ID:")]
+    assert ids == ["ID: 1", "ID: 2", "ID: 3", "ID: 4", "ID: 5"]
+
+
+def test_sender_splits_batches_and_rate_limits(tmp_path):
+    writer = SpoolWriter()
+    for pk in range(4):
+        writer.append(str(tmp_path), 300, make_event(pk, name="x" * 60))
+    writer.close()
+    send = MagicMock(return_value=True)
+    clock = FakeClock()
+
+    sender = SpoolSender(
+        str(tmp_path), rate_limit=0.5, max_length=150,
+        send=send, clock=clock, sleep=clock.sleep,
+    )
+    sender.run_once()
+
+    assert send.call_count == 4
+    assert clock.sleeps == [2.0, 2.0, 2.0]
+
+
+def test_sender_removes_old_delivered_segments(tmp_path):
+    old_segment = tmp_path / "000000000001-123.jsonl"
+    old_segment.write_text(make_event(1).to_json() + "\n")
+    send = MagicMock(return_value=True)
+
+    sender = SpoolSender(str(tmp_path), send=send)
+    sender.run_once()
+
+    assert not old_segment.exists()
+    assert sender.offsets == {}
+
+
+def test_sender_drops_stale_partial_line_in_old_segment(tmp_path, caplog):
+    old_segment = tmp_path / "000000000001-123.jsonl"
+    old_segment.write_text(make_event(1).to_json() + "\n" + '{"model_label": "shop.Order", "pk"')
+    send = MagicMock(return_value=True)
+    sender = SpoolSender(str(tmp_path), send=send)
+
+    assert sender.run_once() == 1
+    assert old_segment.exists()  # the tail might still be growing
+
+    assert sender.run_once() == 0
+    assert not old_segment.exists()
+    assert sender.offsets == {}
+    assert "partial line" in caplog.text
+    send.assert_called_once()
+
+
+def test_sender_keeps_old_segment_while_tail_grows(tmp_path):
+    old_segment = tmp_path / "000000000001-123.jsonl"
+    old_segment.write_text('{"model_label": ')
+    sender = SpoolSender(str(tmp_path), send=MagicMock(return_value=True))
+    sender.run_once()
+
+    with open(old_segment, "a") as f:
+        f.write('"shop.Order", "pk"')
+    sender.run_once()
+
+    assert old_segment.exists()
+
+
+# ---------------------------------------------------------------------------
+# Management command
+# ---------------------------------------------------------------------------
+
+@pytest.mark.django_db(transaction=True)
+def test_sender_command_delivers_spooled_events(tmp_path):
+    model = make_model(template={"create": "New: {name}"})
+    mock_response = MagicMock()
+    mock_response.raise_for_status.return_value = None
+
+    with spool_settings(tmp_path):
+        model.objects.create(name="Alice")
+        model.objects.create(name="Bob")
+
+        with patch("django_team_events.providers.google_chat.requests.post", return_value=mock_response) as mock_post:
+            out = StringIO()
+            call_command("teamevents_sender", "--once", stdout=out)
+
+    mock_post.assert_called_once()
+    assert mock_post.call_args[1]["json"]["text"] == "New: Alice\n\nNew: Bob"
+    assert "Delivered 2 spooled events." in out.getvalue()
+
+
+def test_sender_command_requires_webhook(tmp_path):
+    with override_settings(DJANGO_TEAM_EVENTS={"DELIVERY": "spool", "SPOOL_DIR": str(tmp_path)}):
+        with pytest.raises(CommandError, match="GCHAT_WEBHOOK"):
+            call_command("teamevents_sender", "--once", stdout=StringIO())
+
+
+def test_sender_command_once_refuses_while_another_sender_runs(tmp_path):
+    writer = SpoolWriter()
+    writer.append(str(tmp_path), 300, make_event(1))
+    writer.close()
+    send = MagicMock(return_value=True)
+
+    with spool_settings(tmp_path), SpoolSender(str(tmp_path), send=send).exclusive():
+        with patch("django_team_events.providers.google_chat.requests.post") as mock_post:
+            with pytest.raises(CommandError, match="already running"):
+                call_command("teamevents_sender", "--once", stdout=StringIO())
+
+    mock_post.assert_not_called()
@@ -0,0 +1,199 @@
+import asyncio
+import inspect
+import itertools
+import threading
+from unittest.mock import MagicMock, patch
+
+import pytest
+from django.core import serializers
+from django.db import connection, models
+from django.test.utils import CaptureQueriesContext
+
+from django_team_events import TeamEvents
+
+WEBHOOK_URL = "https://chat.googleapis.com/fake-webhook"
+
+_counter = itertools.count(700)
+
+
+def make_model(notify_on=("create", "update", "delete"), **team_events_kwargs):
+    model_name = f"SuppressTestModel{next(_counter)}"
+
+    class Meta:
+        app_label = "django_team_events"
+
+    attrs = {
+        "__module__": __name__,
+        "Meta": Meta,
+        "name": models.CharField(max_length=100),
+        "team_events": TeamEvents(notify_on=list(notify_on), **team_events_kwargs),
+    }
+    model = type(model_name, (models.Model,), attrs)
+
+    connection.disable_constraint_checking()
+    with connection.schema_editor() as editor:
+        editor.create_model(model)
+    connection.enable_constraint_checking()
+
+    return model
+
+
+@pytest.fixture
+def mock_post():
+    mock_response = MagicMock()
+    mock_response.raise_for_status.return_value = None
+
+    with patch("django_team_events.providers.google_chat.get_gchat_webhook", return_value=WEBHOOK_URL):
+        with patch("django_team_events.providers.google_chat.requests.post", return_value=mock_response) as mock_post:
+            yield mock_post
+
+
+def load_fixture(model, pk, name):
+    data = f'[{{"model": "{model._meta.label_lower}", "pk": {pk}, "fields": {{"name": "{name}"}}}}]'
+    for obj in serializers.deserialize("json", data):
+        obj.save()
+
+
+# ---------------------------------------------------------------------------
+# Raw saves
+# ---------------------------------------------------------------------------
+
+@pytest.mark.django_db(transaction=True)
+def test_raw_saves_skipped_by_default(mock_post):
+    model = make_model()
+    load_fixture(model, 1, "Alice")
+
+    with CaptureQueriesContext(connection) as queries:
+        load_fixture(model, 1, "Bob")
+
+    mock_post.assert_not_called()
+    assert len(queries) == 1
+
+
+@pytest.mark.django_db(transaction=True)
+def test_raw_saves_notify_when_skip_raw_disabled(mock_post):
+    model = make_model(skip_raw=False)
+    load_fixture(model, 1, "Alice")
+
+    mock_post.assert_called_once()
+
+
+# ---------------------------------------------------------------------------
+# TeamEvents.suppressed()
+# ---------------------------------------------------------------------------
+
+@pytest.mark.django_db(transaction=True)
+def test_suppressed_globally(mock_post):
+    model = make_model()
+
+    with TeamEvents.suppressed():
+        instance = model.objects.create(name="Alice")
+        instance.name = "Bob"
+        with CaptureQueriesContext(connection) as queries:
+            instance.save()
+        instance.delete()
+
+    mock_post.assert_not_called()
+    assert len(queries) == 1
+
+
+@pytest.mark.django_db(transaction=True)
+def test_suppressed_for_one_model_only(mock_post):
+    suppressed_model = make_model(notify_on=["create"])
+    other_model = make_model(notify_on=["create"])
+
+    with TeamEvents.suppressed(suppressed_model):
+        suppressed_model.objects.create(name="Alice")
+        other_model.objects.create(name="Bob")
+
+    mock_post.assert_called_once()
+    assert other_model.__name__ in mock_post.call_args[1]["json"]["text"]
+
+
+@pytest.mark.django_db(transaction=True)
+def test_suppressed_accepts_model_label(mock_post):
+    model = make_model(notify_on=["create"])
+
+    with TeamEvents.suppressed(model._meta.label):
+        model.objects.create(name="Alice")
+
+    mock_post.assert_not_called()
+
+
+@pytest.mark.django_db(transaction=True)
+def test_suppressed_as_decorator(mock_post):
+    model = make_model(notify_on=["create"])
+
+    @TeamEvents.suppressed(model)
+    def backfill():
+        for i in range(3):
+            model.objects.create(name=f"user{i}")
+
+    backfill()
+    mock_post.assert_not_called()
+
+    model.objects.create(name="after")
+    mock_post.assert_called_once()
+
+
+@pytest.mark.django_db(transaction=True)
+def test_suppressed_summary_sent_on_exit(mock_post):
+    model = make_model()
+
+    with TeamEvents.suppressed(summary=True):
+        for i in range(3):
+            instance = model.objects.create(name=f"user{i}")
+        instance.name = "renamed"
+        instance.save()
+        mock_post.assert_not_called()
+
+    mock_post.assert_called_once()
+    text = mock_post.call_args[1]["json"]["text"]
+    assert f"[{model.__name__}] 4 events suppressed" in text
+    assert "- create: 3" in text
+    assert "- update: 1" in text
+
+
+def test_suppression_does_not_leak_to_other_threads():
+    from django_team_events.suppression import get_suppression
+
+    seen = []
+    with TeamEvents.suppressed():
+        thread = threading.Thread(target=lambda: seen.append(get_suppression("app.Model")))
+        thread.start()
+        thread.join()
+        assert get_suppression("app.Model") is not None
+
+    assert seen == [None]
+    assert get_suppression("app.Model") is None
+
+
+def test_suppression_is_scoped_per_async_task():
+    from django_team_events.suppression import get_suppression
+
+    async def suppressed_task():
+        with TeamEvents.suppressed():
+            await asyncio.sleep(0.01)
+            return get_suppression("app.Model") is not None
+
+    async def plain_task():
+        await asyncio.sleep(0.005)
+        return get_suppression("app.Model") is not None
+
+    async def main():
+        return await asyncio.gather(suppressed_task(), plain_task())
+
+    assert asyncio.run(main()) == [True, False]
+
+
+def test_suppressed_decorates_async_function():
+    from django_team_events.suppression import get_suppression
+
+    @TeamEvents.suppressed("app.Model")
+    async def view():
+        await asyncio.sleep(0)
+        return get_suppression("app.Model") is not None
+
+    assert inspect.iscoroutinefunction(view)
+    assert asyncio.run(view()) is True
+    assert get_suppression("app.Model") is None
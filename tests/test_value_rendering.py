@@ -0,0 +1,166 @@
+import itertools
+from unittest.mock import MagicMock, patch
+
+import pytest
+from django.db import connection, models
+from django.test import override_settings
+
+from django_team_events import TeamEvents
+from django_team_events.events import Event, LargeValue
+from django_team_events.formatter import render, render_value, truncate
+
+WEBHOOK_URL = "https://chat.googleapis.com/fake-webhook"
+
+_counter = itertools.count(1100)
+
+
+def make_model(fields, notify_on=("create",)):
+    model_name = f"RenderTestModel{next(_counter)}"
+
+    class Meta:
+        app_label = "django_team_events"
+
+    attrs = {
+        "__module__": __name__,
+        "Meta": Meta,
+        "team_events": TeamEvents(notify_on=list(notify_on)),
+    }
+    attrs.update(fields)
+    model = type(model_name, (models.Model,), attrs)
+
+    connection.disable_constraint_checking()
+    with connection.schema_editor() as editor:
+        editor.create_model(model)
+    connection.enable_constraint_checking()
+
+    return model
+
+
+def create_and_capture(model, **values):
+    mock_response = MagicMock()
+    mock_response.raise_for_status.return_value = None
+
+    with patch("django_team_events.providers.google_chat.get_gchat_webhook", return_value=WEBHOOK_URL):
+        with patch("django_team_events.providers.google_chat.requests.post", return_value=mock_response) as mock_post:
+            model.objects.create(**values)
+    return mock_post.call_args[1]["json"]["text"]
+
+
+# ---------------------------------------------------------------------------
+# Value renderers
+# ---------------------------------------------------------------------------
+
+def test_short_values_render_unchanged():
+    assert render_value("Alice") == "Alice"
+    assert render_value(42) == "42"
+    assert render_value(None) == "None"
+
+
+def test_long_text_is_truncated_with_marker():
+    rendered = render_value("a" * 1000, {"max_value_length": 50, "type_max_lengths": {}})
+
+    assert len(rendered) == 50
+    assert rendered.endswith("… (1000 chars)")
+
+
+def test_binary_rendered_by_size():
+    assert render_value(b"\x00" * 2048) == "<2048 bytes>"
+    assert render_value(memoryview(b"abc")) == "<3 bytes>"
+
+
+def test_nested_json_is_bounded():
+    value = {"items": [{"id": i, "tags": list(range(100))} for i in range(1000)]}
+
+    rendered = render_value(value, {"max_value_length": 80, "type_max_lengths": {}})
+
+    assert len(rendered) <= 80
+
+
+def test_type_specific_max_length():
+    limits = {"max_value_length": 10, "type_max_lengths": {"text": 100}}
+
+    assert render_value("a" * 50, limits) == "a" * 50
+    assert len(render_value(list(range(50)), limits)) == 10
+
+
+def test_large_value_marker_rendered_as_is():
+    assert render_value(LargeValue(5000, "chars")) == "<5000 chars>"
+    assert render_value(LargeValue(65536, "chars", exact=False)) == "<≥65536 chars>"
+
+
+def test_truncate_without_limit():
+    assert truncate("abc", None) == "abc"
+
+
+# ---------------------------------------------------------------------------
+# Message budget
+# ---------------------------------------------------------------------------
+
+def test_message_budget_stops_rendering_fields():
+    values = [(f"field{i}", "x" * 100) for i in range(100)]
+    event = Event("shop.Order", 1, "create", values=values, object_repr="Order 1")
+
+    text = render(event, limits={"max_message_length": 1000})
+
+    assert len(text) <= 1000
+    assert "- field0: " in text
+    assert "- field99: " not in text
+    assert text.splitlines()[-1].endswith(" more")
+
+
+def test_message_budget_counts_skipped_changes():
+    diff = [(f"field{i}", "old", "new") for i in range(10)]
+    event = Event("shop.Order", 1, "update", diff=diff)
+
+    text = render(event, limits={"max_message_length": 100})
+
+    shown = sum(1 for line in text.splitlines() if line.startswith("- field"))
+    assert len(text) <= 100
+    assert text.endswith(f"… {10 - shown} more")
+
+
+def test_template_output_is_capped_to_budget():
+    event = Event("shop.Order", 1, "create", values=[("body", "x" * 10000)])
+
+    text = render(event, {"create": "Body: {body}"}, {"max_message_length": 500})
+
+    assert len(text) == 500
+
+
+# ---------------------------------------------------------------------------
+# End to end
+# ---------------------------------------------------------------------------
+
+@pytest.mark.django_db(transaction=True)
+def test_create_message_stays_within_provider_limit():
+    model = make_model({
+        "title": models.CharField(max_length=200000),
+        "body": models.TextField(),
+        "blob": models.BinaryField(),
+        "data": models.JSONField(),
+    })
+
+    text = create_and_capture(
+        model,
+        title="t" * 100000,
+        body="a" * 100000,
+        blob=b"\x01" * 100000,
+        data={"rows": [list(range(100)) for _ in range(100)]},
+    )
+
+    assert len(text) <= 4096
+    assert "… (100000 chars)" in text
+    assert "- body: <100000 chars>" in text
+    assert "- blob: <100000 bytes>" in text
+    assert "- data: <29210 chars>" in text
+
+
+@pytest.mark.django_db(transaction=True)
+def test_max_value_length_setting():
+    model = make_model({"body": models.TextField()})
+
+    with override_settings(DJANGO_TEAM_EVENTS={"MAX_VALUE_LENGTH": 20}):
+        text = create_and_capture(model, body="a" * 100)
+
+    body_line = next(line for line in text.splitlines() if line.startswith("- body: "))
+    assert len(body_line) == len("- body: ") + 20